@@ -1,17 +1,33 @@
 import argparse
 import datetime as dt
+import hashlib
 import json
+import multiprocessing
 import os
+import queue
 import random
 import shutil
 import sys
 import tempfile
+import threading
 import zipfile
+import zlib
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
 import albumentations as A
 import cv2
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    from turbojpeg import TJPF_BGR, TurboJPEG
+except ImportError:
+    TurboJPEG = None
 import numpy as np
 import yaml
 from PIL import Image
@@ -71,6 +87,15 @@ def parse_args() -> argparse.Namespace:
         default=50,
         help="Early‑stopping patience in epochs (default: 50).",
     )
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=1e-4,
+        help=(
+            "Minimum fitness improvement that resets the early‑stopping "
+            "counter; smaller gains count as a plateau (default: 1e-4)."
+        ),
+    )
     parser.add_argument(
         "--batch",
         type=int,
@@ -88,6 +113,34 @@ def parse_args() -> argparse.Namespace:
         default="0",
         help="Training device: GPU index like '0' or 'cpu' (default: '0').",
     )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="RNG seed for the train/valid/test split and augmentation (default: 0).",
+    )
+    parser.add_argument(
+        "--rot-step",
+        type=int,
+        default=12,
+        help="Step in degrees between fine-rotation augmentations (default: 12).",
+    )
+    parser.add_argument(
+        "--zoom-min",
+        type=int,
+        default=40,
+        help="Smallest zoom-out scale in percent to augment with (default: 40).",
+    )
+    parser.add_argument(
+        "--intermediate-format",
+        choices=["jpg", "npy"],
+        default="jpg",
+        help=(
+            "Format for augmented images: 'jpg' (default, trainer-compatible) "
+            "or 'npy' raw arrays, which skip the JPEG encode/decode round-trip "
+            "for same-host pipelines with a loader that reads .npy."
+        ),
+    )
 
     return parser.parse_args()
 
@@ -96,29 +149,114 @@ def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+def _fast_copy(src: str, dst: str) -> None:
+    """
+    Copy a file as cheaply as possible: hardlink when src and dst share a
+    filesystem (a pure metadata op), then a zero-copy sendfile loop, then
+    plain shutil.copyfile for filesystems that support neither (e.g.
+    Azure Files mounts).
+    """
+    # A previous run may have left dst as a hardlink of src; truncating
+    # it for a re-copy would zero out the shared inode — i.e. the source
+    # file. Same inode means same content, so there's nothing to do.
+    try:
+        if os.path.samefile(src, dst):
+            return
+        os.unlink(dst)
+    except OSError:
+        pass
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+    try:
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            remaining = os.fstat(s.fileno()).st_size
+            offset = 0
+            # sendfile may write fewer bytes than asked; loop until done.
+            while remaining > 0:
+                sent = os.sendfile(d.fileno(), s.fileno(), offset, remaining)
+                if sent == 0:
+                    raise OSError("sendfile returned 0 before EOF")
+                offset += sent
+                remaining -= sent
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def _extract_zip(zip_path: str, dest: str) -> None:
+    """
+    Extract a ZIP with one thread per CPU. zlib inflate releases the GIL,
+    so members decompress concurrently; ZipFile serialises the shared
+    seek/read internally.
+    """
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        members = zf.namelist()
+        # Pre-create every parent directory: concurrent zf.extract calls
+        # race on makedirs (exists-check then create without exist_ok),
+        # which can raise FileExistsError on slow/network filesystems.
+        for subdir in {os.path.dirname(name) for name in members if os.path.dirname(name)}:
+            os.makedirs(os.path.join(dest, subdir), exist_ok=True)
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+            list(ex.map(lambda name: zf.extract(name, dest), members))
+
+
 ##############################################
 #  COCO → YOLO CONVERSION (from app.py)
 ##############################################
 
+def _parse_coco(coco_json: str) -> tuple[dict, dict, dict]:
+    """
+    Parse a COCO annotation file into (images, categories, img_to_anns).
+
+    Streams the file with ijson in three passes when available, so
+    multi-GB annotation files are never materialized in memory at once;
+    falls back to a plain json.load otherwise.
+    """
+    img_to_anns: dict[int, list[dict]] = defaultdict(list)
+
+    if ijson is not None:
+        with open(coco_json, "rb") as f:
+            images = {img["id"]: img for img in ijson.items(f, "images.item")}
+            f.seek(0)
+            categories = {
+                cat["id"]: cat["name"] for cat in ijson.items(f, "categories.item")
+            }
+            f.seek(0)
+            for ann in ijson.items(f, "annotations.item"):
+                img_to_anns[ann["image_id"]].append(ann)
+    else:
+        with open(coco_json, "r") as f:
+            coco = json.load(f)
+        images = {img["id"]: img for img in coco["images"]}
+        categories = {cat["id"]: cat["name"] for cat in coco["categories"]}
+        for ann in coco["annotations"]:
+            img_to_anns[ann["image_id"]].append(ann)
+
+    return images, categories, img_to_anns
+
+
 def coco_to_yolo_noninteractive(
     coco_json: str,
     output_dir: str,
     train_ratio: float = 0.7,
     val_ratio: float = 0.2,
     test_ratio: float = 0.1,
+    seed: int | None = None,
 ) -> tuple[bool, int, int, int, list[str]]:
     """
     Logic copied from Product-detection/app.py::coco_to_yolo_streamlit,
     but without Streamlit callbacks/UI.
     """
     try:
-        with open(coco_json, "r") as f:
-            coco = json.load(f)
+        images, categories, img_to_anns = _parse_coco(coco_json)
 
-        images = {img["id"]: img for img in coco["images"]}
-        annotations = coco["annotations"]
-        categories = {cat["id"]: cat["name"] for cat in coco["categories"]}
-        category_mapping = {cat_id: idx for idx, cat_id in enumerate(categories.keys())}
+        # Dense LUT instead of a dict: COCO category ids are small ints, so
+        # the per-annotation class lookup becomes an array index (and the
+        # bbox path can map all ids in one fancy-index below).
+        cat_lut = np.full(max(categories.keys()) + 1, -1, dtype=np.int32)
+        cat_lut[list(categories.keys())] = np.arange(len(categories), dtype=np.int32)
 
         # Create YOLO dirs with structure:
         # output_dir/train/images, valid/images, test/images and labels accordingly
@@ -126,72 +264,121 @@ def coco_to_yolo_noninteractive(
             os.makedirs(os.path.join(output_dir, split, "images"), exist_ok=True)
             os.makedirs(os.path.join(output_dir, split, "labels"), exist_ok=True)
 
-        # Split dataset
-        image_ids = list(images.keys())
-        random.shuffle(image_ids)
+        # Split dataset: one permutation plus an int8 assignment array
+        # instead of shuffling a full list and building three big sets.
+        # Seeding makes the split reproducible across runs.
+        rng = np.random.default_rng(seed)
+        image_ids = np.fromiter(images.keys(), dtype=np.int64, count=len(images))
+        perm = rng.permutation(len(image_ids))
         n_train = int(len(image_ids) * train_ratio)
         n_val = int(len(image_ids) * val_ratio)
-        train_ids = set(image_ids[:n_train])
-        val_ids = set(image_ids[n_train : n_train + n_val])
-        test_ids = set(image_ids[n_train + n_val :])
-
-        img_to_anns: dict[int, list[dict]] = defaultdict(list)
-        for ann in annotations:
-            img_to_anns[ann["image_id"]].append(ann)
+        n_test = len(image_ids) - n_train - n_val
+        split_idx = np.empty(len(image_ids), dtype=np.int8)
+        split_idx[perm[:n_train]] = 0
+        split_idx[perm[n_train : n_train + n_val]] = 1
+        split_idx[perm[n_train + n_val :]] = 2
+        id_to_split = dict(zip(image_ids.tolist(), split_idx.tolist()))
+        split_names = ("train", "valid", "test")
 
         total_images = len(img_to_anns)
 
+        # Hoist per-image path work out of the loop: one directory walk
+        # replaces an os.path.exists stat per image (slow on Azure Files),
+        # and the split dirs are joined once instead of per iteration.
+        # Key by path relative to the annotation file — the form COCO
+        # file_name takes — so duplicate basenames across subdirectories
+        # resolve exactly; keep the bare basename only as a fallback.
+        coco_parent = Path(coco_json).parent
+        existing_files: dict[str, str] = {}
+        for root, _, files in os.walk(coco_parent):
+            rel_root = os.path.relpath(root, coco_parent).replace(os.sep, "/")
+            for fname in files:
+                full = os.path.join(root, fname)
+                rel = fname if rel_root == "." else f"{rel_root}/{fname}"
+                existing_files[rel] = full
+                existing_files.setdefault(fname, full)
+
+        split_img_dirs = {
+            s: os.path.join(output_dir, s, "images") for s in ("train", "valid", "test")
+        }
+        split_lbl_dirs = {
+            s: os.path.join(output_dir, s, "labels") for s in ("train", "valid", "test")
+        }
+
         for img_id, anns in tqdm(img_to_anns.items(), desc="Converting COCO → YOLO"):
             img_info = images[img_id]
             file_name = img_info["file_name"]
+            base_name = file_name.rsplit("/", 1)[-1]
+            stem = base_name.rsplit(".", 1)[0]
 
             # width/height from JSON or image
             if "width" in img_info and "height" in img_info:
                 width, height = img_info["width"], img_info["height"]
             else:
-                img_path = Path(coco_json).parent / file_name
-                with Image.open(img_path) as im:
+                with Image.open(coco_parent / file_name) as im:
                     width, height = im.size
 
             # Decide split (use "valid" instead of "val")
-            if img_id in train_ids:
-                split = "train"
-            elif img_id in val_ids:
-                split = "valid"
-            else:
-                split = "test"
+            split = split_names[id_to_split[img_id]]
 
-            # Copy image to split/images
-            src_path = Path(coco_json).parent / file_name
-            dst_path = Path(output_dir) / split / "images" / Path(file_name).name
-            os.makedirs(dst_path.parent, exist_ok=True)
-            if os.path.exists(src_path):
-                shutil.copy(src_path, dst_path)
+            # Copy image to split/images (lookup table instead of a stat)
+            src_path = existing_files.get(file_name) or existing_files.get(base_name)
+            if src_path is not None:
+                _fast_copy(src_path, os.path.join(split_img_dirs[split], base_name))
 
             # Write YOLO label to split/labels
-            label_path = Path(output_dir) / split / "labels" / (Path(file_name).stem + ".txt")
+            label_path = os.path.join(split_lbl_dirs[split], stem + ".txt")
+
+            # Partition annotations so each kind can be normalized in one
+            # vectorized pass instead of per-point Python arithmetic.
+            poly_anns: list[dict] = []
+            bbox_anns: list[dict] = []
+            for ann in anns:
+                if (
+                    "segmentation" in ann
+                    and isinstance(ann["segmentation"], list)
+                    and len(ann["segmentation"]) > 0
+                ):
+                    poly_anns.append(ann)
+                else:
+                    bbox_anns.append(ann)
+
+            lines: list[str] = []
+
+            if poly_anns:
+                # Stack all polygon points, normalize and format in bulk
+                lengths = [len(ann["segmentation"][0]) // 2 for ann in poly_anns]
+                pts = np.concatenate(
+                    [
+                        np.asarray(ann["segmentation"][0], dtype=np.float32)
+                        for ann in poly_anns
+                    ]
+                ).reshape(-1, 2)
+                pts /= np.array([width, height], dtype=np.float32)
+                coord_strs = np.char.mod("%.6f", pts.ravel())
+                offset = 0
+                for ann, n_pts in zip(poly_anns, lengths):
+                    class_id = cat_lut[ann["category_id"]]
+                    poly_str = " ".join(coord_strs[offset : offset + 2 * n_pts])
+                    lines.append(f"{class_id} {poly_str}")
+                    offset += 2 * n_pts
+
+            if bbox_anns:
+                xywh = np.array(
+                    [ann["bbox"] for ann in bbox_anns], dtype=np.float32
+                )
+                cls = cat_lut[[ann["category_id"] for ann in bbox_anns]]
+                cx = (xywh[:, 0] + xywh[:, 2] / 2) / width
+                cy = (xywh[:, 1] + xywh[:, 3] / 2) / height
+                nw = xywh[:, 2] / width
+                nh = xywh[:, 3] / height
+                rows = np.char.mod("%.6f", np.stack([cx, cy, nw, nh], axis=1))
+                for class_id, row in zip(cls, rows):
+                    lines.append(f"{class_id} " + " ".join(row))
+
             with open(label_path, "w") as f:
-                for ann in anns:
-                    cat_id = ann["category_id"]
-                    class_id = category_mapping[cat_id]
-
-                    # Polygon segmentation if available
-                    if (
-                        "segmentation" in ann
-                        and isinstance(ann["segmentation"], list)
-                        and len(ann["segmentation"]) > 0
-                    ):
-                        poly = np.array(ann["segmentation"][0]).reshape(-1, 2)
-                        poly[:, 0] /= width
-                        poly[:, 1] /= height
-                        poly_str = " ".join([f"{x:.6f} {y:.6f}" for x, y in poly])
-                        f.write(f"{class_id} {poly_str}\n")
-                    else:
-                        # Fallback to bbox
-                        x, y, w, h = ann["bbox"]
-                        cx, cy = (x + w / 2) / width, (y + h / 2) / height
-                        nw, nh = w / width, h / height
-                        f.write(f"{class_id} {cx:.6f} {cy:.6f} {nw:.6f} {nh:.6f}\n")
+                if lines:
+                    f.write("\n".join(lines) + "\n")
 
         # Create classes.txt
         class_names = [categories[k] for k in sorted(categories.keys())]
@@ -212,7 +399,7 @@ def coco_to_yolo_noninteractive(
         with open(Path(output_dir) / "data.yaml", "w") as yf:
             yaml.dump(yaml_dict, yf, default_flow_style=False)
 
-        return True, len(train_ids), len(val_ids), len(test_ids), class_names
+        return True, n_train, n_val, n_test, class_names
 
     except Exception as exc:
         log(f"COCO → YOLO conversion failed: {exc}")
@@ -225,6 +412,7 @@ def unzip_and_convert_noninteractive(
     train_ratio: float = 0.7,
     val_ratio: float = 0.2,
     test_ratio: float = 0.1,
+    seed: int | None = None,
 ) -> tuple[bool, int, int, int, list[str]]:
     """
     Wrapper around coco_to_yolo_noninteractive that mirrors
@@ -232,24 +420,23 @@ def unzip_and_convert_noninteractive(
     """
     with tempfile.TemporaryDirectory() as tmpdir:
         log(f"Extracting COCO ZIP: {zip_path}")
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            zip_ref.extractall(tmpdir)
-
-        # Find coco.json or *coco*.json inside extracted folder
-        coco_json: str | None = None
-        for root, _, files in os.walk(tmpdir):
-            if "coco.json" in files:
-                coco_json = os.path.join(root, "coco.json")
-                break
-            for file in files:
-                if file.endswith(".json") and "coco" in file.lower():
-                    coco_json = os.path.join(root, file)
-                    break
-            if coco_json:
-                break
+        _extract_zip(zip_path, tmpdir)
+
+        # Find coco.json or *coco*.json inside extracted folder. rglob is
+        # lazy, so next() stops at the first hit instead of walking every
+        # extracted image directory.
+        coco_path = next(Path(tmpdir).rglob("coco.json"), None) or next(
+            (
+                p
+                for p in Path(tmpdir).rglob("*.json")
+                if "coco" in p.name.lower()
+            ),
+            None,
+        )
 
-        if coco_json is None:
+        if coco_path is None:
             raise FileNotFoundError("coco.json not found inside ZIP!")
+        coco_json = str(coco_path)
 
         return coco_to_yolo_noninteractive(
             coco_json,
@@ -257,6 +444,7 @@ def unzip_and_convert_noninteractive(
             train_ratio=train_ratio,
             val_ratio=val_ratio,
             test_ratio=test_ratio,
+            seed=seed,
         )
 
 
@@ -264,140 +452,718 @@ def unzip_and_convert_noninteractive(
 #  AUGMENTATION (from app.py)
 ##############################################
 
-def parse_yolo_label(line: str) -> dict:
-    parts = line.strip().split()
-    cls = int(parts[0])
-    coords = list(map(float, parts[1:]))
-    if len(coords) == 4:
-        return {"class": cls, "bbox": coords, "poly": None}
-    poly = [(coords[i], coords[i + 1]) for i in range(0, len(coords), 2)]
-    return {"class": cls, "bbox": None, "poly": poly}
+def parse_yolo_labels(path: Path) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse a YOLO label file into struct-of-arrays form:
+
+      bboxes    (M, 5) float32 rows of [class, cx, cy, w, h],
+      poly_pts  (K, 2) float32 normalized polygon points (all polygons flat),
+      poly_meta (P, 3) int32 rows of [class, start, length] into poly_pts.
 
+    Arrays instead of one dict per annotation keep the augmentation inner
+    loops free of per-label allocations and dict lookups.
+    """
+    bbox_rows: list[list[float]] = []
+    poly_chunks: list[np.ndarray] = []
+    poly_meta_rows: list[tuple[int, int, int]] = []
+    n_pts = 0
+
+    with open(path, "r") as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            cls = int(parts[0])
+            coords = np.asarray(parts[1:], dtype=np.float32)
+            if coords.size == 4:
+                bbox_rows.append([cls, *coords.tolist()])
+            else:
+                pts = coords.reshape(-1, 2)
+                poly_chunks.append(pts)
+                poly_meta_rows.append((cls, n_pts, len(pts)))
+                n_pts += len(pts)
+
+    bboxes = np.asarray(bbox_rows, dtype=np.float32).reshape(-1, 5)
+    if poly_chunks:
+        poly_pts = np.concatenate(poly_chunks)
+    else:
+        poly_pts = np.empty((0, 2), dtype=np.float32)
+    poly_meta = np.asarray(poly_meta_rows, dtype=np.int32).reshape(-1, 3)
+    return bboxes, poly_pts, poly_meta
+
+
+def save_yolo_label(
+    path: Path,
+    bboxes: np.ndarray,
+    poly_pts: np.ndarray,
+    poly_meta: np.ndarray,
+) -> None:
+    """Write SoA labels (see parse_yolo_labels) with one buffered write."""
+    lines: list[str] = []
+
+    if len(bboxes):
+        vals = np.char.mod("%.6f", bboxes[:, 1:])
+        for cls, row in zip(bboxes[:, 0].astype(np.int64), vals):
+            lines.append(f"{cls} " + " ".join(row))
+
+    if len(poly_meta):
+        coord_strs = np.char.mod("%.6f", poly_pts.ravel())
+        for cls, start, length in poly_meta:
+            lines.append(
+                f"{cls} " + " ".join(coord_strs[2 * start : 2 * (start + length)])
+            )
 
-def save_yolo_label(path: Path, labels: list[dict]) -> None:
     with open(path, "w") as f:
-        for lab in labels:
-            cls = lab["class"]
-            if lab["bbox"] is not None:
-                cx, cy, w, h = lab["bbox"]
-                f.write(f"{cls} {cx:.6f} {cy:.6f} {w:.6f} {h:.6f}\n")
-            elif lab["poly"] is not None:
-                poly_str = " ".join([f"{x:.6f} {y:.6f}" for x, y in lab["poly"]])
-                f.write(f"{cls} {poly_str}\n")
+        if lines:
+            f.write("\n".join(lines) + "\n")
 
 
 def reconstruct_polygons_from_keypoints(
-    keypoints: list[tuple[float, float]],
-    poly_splits: list[tuple[int, int, int]],
-) -> list[tuple[int, list[tuple[float, float]]]]:
-    polys: list[tuple[int, list[tuple[float, float]]]] = []
-    for cls, start, length in poly_splits:
-        pts = keypoints[start : start + length]
-        polys.append((cls, pts))
-    return polys
+    keypoints: np.ndarray,
+    poly_meta: np.ndarray,
+) -> list[tuple[int, np.ndarray]]:
+    """Split the packed (K, 2) keypoint array back into per-polygon views."""
+    if not len(poly_meta):
+        return []
+    chunks = np.split(keypoints, np.cumsum(poly_meta[:, 2])[:-1])
+    return list(zip(poly_meta[:, 0], chunks))
 
 
 def polygon_to_bbox_norm(
-    poly_pts: list[tuple[float, float]],
+    poly_pts: np.ndarray,
     img_w: int,
     img_h: int,
-) -> list[float]:
-    xs = [p[0] for p in poly_pts]
-    ys = [p[1] for p in poly_pts]
-    x1, x2 = min(xs), max(xs)
-    y1, y2 = min(ys), max(ys)
-    cx = ((x1 + x2) / 2) / img_w
-    cy = ((y1 + y2) / 2) / img_h
-    bw = (x2 - x1) / img_w
-    bh = (y2 - y1) / img_h
-    return [cx, cy, bw, bh]
+) -> np.ndarray:
+    mn = poly_pts.min(axis=0)
+    mx = poly_pts.max(axis=0)
+    size = np.array([img_w, img_h], dtype=np.float32)
+    return np.concatenate([(mn + mx) / 2 / size, (mx - mn) / size])
+
+
+def _reflection_reduce(img: np.ndarray, **kwargs: object) -> np.ndarray:
+    """
+    Median blur followed by color jitter, with brightness and contrast
+    fused into one 256-entry LUT so the jitter costs a single cv2.LUT
+    pass instead of several full-image float ops.
+    """
+    out = cv2.medianBlur(img, 5)
+
+    brightness = np.random.uniform(0.7, 1.3)
+    contrast = np.random.uniform(0.7, 1.3)
+    saturation = np.random.uniform(0.7, 1.3)
+    hue_shift = int(np.random.uniform(-0.1, 0.1) * 180.0)
+
+    lut = np.arange(256, dtype=np.float32)
+    lut = ((lut - 127.5) * contrast + 127.5) * brightness
+    out = cv2.LUT(out, np.clip(lut, 0, 255).astype(np.uint8))
+
+    gray = cv2.cvtColor(cv2.cvtColor(out, cv2.COLOR_BGR2GRAY), cv2.COLOR_GRAY2BGR)
+    out = cv2.addWeighted(out, saturation, gray, 1.0 - saturation, 0.0)
+
+    if hue_shift:
+        hsv = cv2.cvtColor(out, cv2.COLOR_BGR2HSV)
+        hsv[..., 0] = (hsv[..., 0].astype(np.int16) + hue_shift) % 180
+        out = cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+
+    return out
 
 
 def low_res(img: np.ndarray, **kwargs: object) -> np.ndarray:
+    """
+    Simulate a low-resolution capture. INTER_AREA is OpenCV's box-average
+    downsample kernel (cleaner and faster than INTER_LINEAR for shrinking);
+    INTER_NEAREST makes the upsample a pure index copy with no filtering.
+    """
     scale_factor = np.random.uniform(0.3, 0.5)
     h, w = img.shape[:2]
     new_h, new_w = max(1, int(h * scale_factor)), max(1, int(w * scale_factor))
-    img_small = cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
-    img_up = cv2.resize(img_small, (w, h), interpolation=cv2.INTER_LINEAR)
-    return img_up
+    img_small = cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_AREA)
+    return cv2.resize(
+        img_small, (w, h), dst=_warp_dst(h, w), interpolation=cv2.INTER_NEAREST
+    )
+
+
+# Optional batched GPU path for the geometric augmentations. torch ships
+# with ultralytics anyway; kornia is an extra and CUDA may be absent, so
+# fall back to the per-image Albumentations loop when unavailable.
+try:
+    import torch
+    import kornia
+
+    _HAS_GPU_GEO = torch.cuda.is_available()
+except ImportError:
+    torch = None
+    kornia = None
+    _HAS_GPU_GEO = False
+
+_GPU_GEO_BATCH = 16
+
+
+def _spec_key(ops: list[dict]) -> tuple:
+    """Canonical key for a geometric spec, used to drop duplicates."""
+    key: list[tuple] = []
+    for op in ops:
+        kind = op["kind"]
+        if kind == "rotate":
+            key.append(("rotate", op["angle"] % 360))
+        elif kind == "shear":
+            key.append(("shear", op["x"], op["y"]))
+        elif kind == "scale":
+            key.append(("scale", op["scale"]))
+        else:
+            key.append((kind,))
+    return tuple(key)
+
+
+def _build_geo_specs(
+    rot_step: int = 12, zoom_min: int = 40
+) -> list[tuple[str, list[dict]]]:
+    """
+    Describe each geometric augmentation as a list of affine primitives
+    so it can be realized either as an Albumentations transform or as a
+    single 2x3 matrix (see _geo_affine_matrix).
+
+    Duplicates (e.g. the fine-rotation sweep re-hitting 180°) are dropped,
+    and rotation density / minimum zoom are tunable via --rot-step and
+    --zoom-min.
+    """
+    geo_specs: list[tuple[str, list[dict]]] = [
+        ("hflip", [{"kind": "hflip"}]),
+        ("vflip", [{"kind": "vflip"}]),
+        ("rot90", [{"kind": "rotate", "angle": 90}]),
+        ("rot180", [{"kind": "rotate", "angle": 180}]),
+        ("rot270", [{"kind": "rotate", "angle": 270}]),
+        ("shear_x15", [{"kind": "shear", "x": 15, "y": 0}]),
+        ("shear_x-15", [{"kind": "shear", "x": -15, "y": 0}]),
+        ("shear_y15", [{"kind": "shear", "x": 0, "y": 15}]),
+        ("shear_y-15", [{"kind": "shear", "x": 0, "y": -15}]),
+    ]
+
+    fine_rotations = [
+        (f"rot{i}", [{"kind": "rotate", "angle": i}])
+        for i in range(rot_step, 360, rot_step)
+    ]
+
+    zoom_outs = [
+        (f"zoom_{scale}", [{"kind": "scale", "scale": scale / 100.0}])
+        for scale in range(90, zoom_min - 10, -10)
+    ]
+
+    deduped: list[tuple[str, list[dict]]] = []
+    seen: set[tuple] = set()
+    for name, ops in geo_specs + fine_rotations + zoom_outs:
+        key = _spec_key(ops)
+        if key in seen:
+            continue
+        seen.add(key)
+        deduped.append((name, ops))
+    return deduped
+
+
+def _geo_affine_matrix(ops: list[dict], img_w: int, img_h: int) -> np.ndarray:
+    """
+    Compose a geometric spec into one 2x3 affine matrix (about the image
+    center), equivalent to applying the ops in order.
+    """
+    cx, cy = (img_w - 1) / 2.0, (img_h - 1) / 2.0
+    combined = np.eye(3, dtype=np.float64)
+    for op in ops:
+        kind = op["kind"]
+        if kind == "hflip":
+            m = np.array([[-1, 0, img_w - 1], [0, 1, 0]], dtype=np.float64)
+        elif kind == "vflip":
+            m = np.array([[1, 0, 0], [0, -1, img_h - 1]], dtype=np.float64)
+        elif kind == "rotate":
+            m = cv2.getRotationMatrix2D((cx, cy), op["angle"], 1.0)
+        elif kind == "scale":
+            m = cv2.getRotationMatrix2D((cx, cy), 0.0, op["scale"])
+        elif kind == "shear":
+            tx = np.tan(np.deg2rad(op["x"]))
+            ty = np.tan(np.deg2rad(op["y"]))
+            m = np.array(
+                [
+                    [1, tx, -tx * cy],
+                    [ty, 1, -ty * cx],
+                ],
+                dtype=np.float64,
+            )
+        else:
+            raise ValueError(f"Unknown geometric op: {kind}")
+        combined = np.vstack([m, [0, 0, 1]]) @ combined
+    return combined[:2].astype(np.float32)
+
+
+def _transform_points(pts: np.ndarray, m: np.ndarray) -> np.ndarray:
+    """Apply a 2x3 affine matrix to an (N, 2) array of points."""
+    return pts @ m[:, :2].T + m[:, 2]
+
+
+def _geo_border_mode(ops: list[dict]) -> int:
+    """
+    Border mode matching what Albumentations used per transform: reflect
+    for rotations/flips (A.Rotate default), constant for shears/zooms
+    (A.Affine default).
+    """
+    if all(op["kind"] in ("rotate", "hflip", "vflip") for op in ops):
+        return cv2.BORDER_REFLECT_101
+    return cv2.BORDER_CONSTANT
+
+
+def _geo_mats_for(img_w: int, img_h: int) -> tuple[list[tuple[str, list[dict]]], np.ndarray]:
+    """Return the geometric specs and their affine matrices for one image size."""
+    specs = _WORKER_AUGS["geo_specs"]
+    cache = _WORKER_AUGS.setdefault("geo_mats", {})
+    key = (img_w, img_h)
+    if key not in cache:
+        cache[key] = np.stack(
+            [_geo_affine_matrix(ops, img_w, img_h) for _, ops in specs]
+        )
+    return specs, cache[key]
+
+
+def _warp_dst(h: int, w: int) -> np.ndarray:
+    """
+    Per-worker reusable output buffer for cv2 calls that accept ``dst=``.
+    Images are written to disk before the next warp runs, so one buffer
+    per size is enough and spares ~70 allocations per image.
+    """
+    bufs = _WORKER_AUGS.setdefault("warp_bufs", {})
+    buf = bufs.get((h, w))
+    if buf is None:
+        buf = np.empty((h, w, 3), dtype=np.uint8)
+        bufs[(h, w)] = buf
+    return buf
+
+
+def _build_photo_augs() -> list[tuple[str, object]]:
+    """Build the (name, transform) list of photometric augmentations."""
+    return [
+        ("brightness_contrast", A.RandomBrightnessContrast(brightness_limit=0.2, contrast_limit=0.2, p=0.7)),
+        ("hsv_shift", A.HueSaturationValue(hue_shift_limit=15, sat_shift_limit=20, val_shift_limit=15, p=0.7)),
+        ("rgb_shift", A.RGBShift(r_shift_limit=15, g_shift_limit=15, b_shift_limit=15, p=0.5)),
+        ("clahe", A.CLAHE(clip_limit=2.0, tile_grid_size=(8, 8), p=0.3)),
+        ("gamma", A.RandomGamma(gamma_limit=(80, 120), p=0.5)),
+        ("motion_blur", A.MotionBlur(blur_limit=3, p=0.3)),
+        ("gauss_noise", A.GaussNoise(p=0.3)),
+        ("low_light", A.RandomBrightnessContrast(brightness_limit=(-0.6, -0.4), contrast_limit=(-0.4, -0.2), p=1.0)),
+        ("overexposed", A.RandomBrightnessContrast(brightness_limit=(0.4, 0.6), contrast_limit=(0.2, 0.4), p=1.0)),
+        ("reflection_reduce", A.Lambda(image=_reflection_reduce, p=1.0)),
+        ("low_res", A.Lambda(image=low_res, p=1.0)),
+    ]
+
+
+def _geo_new_labels(
+    m: np.ndarray,
+    new_w: int,
+    new_h: int,
+    bboxes_pascal: np.ndarray,
+    bboxes_cls: np.ndarray,
+    keypoints: np.ndarray,
+    poly_meta: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rebuild SoA YOLO labels after applying the affine matrix ``m`` to an
+    image, mapping bbox corners and polygon keypoints through the same
+    transform. Returns (bboxes, poly_pts, poly_meta) as in
+    parse_yolo_labels.
+    """
+    bbox_rows: list[np.ndarray] = []
+
+    if len(bboxes_pascal):
+        corners = np.stack(
+            [
+                bboxes_pascal[:, [0, 1]],
+                bboxes_pascal[:, [2, 1]],
+                bboxes_pascal[:, [2, 3]],
+                bboxes_pascal[:, [0, 3]],
+            ],
+            axis=1,
+        )
+        warped = _transform_points(corners.reshape(-1, 2), m).reshape(-1, 4, 2)
+        # Clip to the image like the albumentations pipeline did and drop
+        # boxes warped fully outside; Ultralytics rejects the whole label
+        # file if any coordinate lands outside [0, 1].
+        mins = np.clip(warped.min(axis=1), 0.0, (new_w, new_h))
+        maxs = np.clip(warped.max(axis=1), 0.0, (new_w, new_h))
+        keep = np.all(maxs > mins, axis=1)
+        rows = np.empty((int(keep.sum()), 5), dtype=np.float32)
+        rows[:, 0] = bboxes_cls[keep]
+        rows[:, 1:3] = (mins[keep] + maxs[keep]) / 2 / (new_w, new_h)
+        rows[:, 3:5] = (maxs[keep] - mins[keep]) / (new_w, new_h)
+        bbox_rows.append(rows)
+
+    poly_chunks: list[np.ndarray] = []
+    poly_meta_rows: list[tuple[int, int, int]] = []
+    n_pts = 0
+
+    if len(keypoints):
+        warped_kp = _transform_points(keypoints, m)
+        norm = np.clip(
+            warped_kp / np.array([new_w, new_h], dtype=np.float32), 0.0, 1.0
+        )
+        for cls, pts in reconstruct_polygons_from_keypoints(norm, poly_meta):
+            if len(pts) >= 3:
+                poly_chunks.append(pts)
+                poly_meta_rows.append((cls, n_pts, len(pts)))
+                n_pts += len(pts)
+            else:
+                bbox_norm = polygon_to_bbox_norm(
+                    pts * (new_w, new_h), new_w, new_h
+                )
+                bbox_rows.append(
+                    np.array([[cls, *bbox_norm]], dtype=np.float32)
+                )
+
+    bboxes = (
+        np.concatenate(bbox_rows)
+        if bbox_rows
+        else np.empty((0, 5), dtype=np.float32)
+    )
+    poly_pts = (
+        np.concatenate(poly_chunks)
+        if poly_chunks
+        else np.empty((0, 2), dtype=np.float32)
+    )
+    return bboxes, poly_pts, np.asarray(poly_meta_rows, dtype=np.int32).reshape(-1, 3)
+
+
+def _augment_geo_gpu(
+    image: np.ndarray,
+    stem: str,
+    out_img_dir: Path,
+    out_lbl_dir: Path,
+    bboxes_pascal: np.ndarray,
+    bboxes_cls: np.ndarray,
+    keypoints: np.ndarray,
+    poly_meta: np.ndarray,
+) -> int:
+    """
+    Apply every geometric augmentation to one image as a batched
+    kornia.warp_affine on CUDA — one kernel launch per chunk instead of
+    ~50 per-image CPU warps. Labels are remapped with the same matrices.
+    """
+    h, w = image.shape[:2]
+    specs, mats = _geo_mats_for(w, h)
+
+    img_t = (
+        torch.from_numpy(np.ascontiguousarray(image))
+        .to("cuda")
+        .permute(2, 0, 1)
+        .float()
+        .unsqueeze(0)
+    )
+
+    n_aug = 0
+    for i in range(0, len(specs), _GPU_GEO_BATCH):
+        chunk = mats[i : i + _GPU_GEO_BATCH]
+        m_t = torch.from_numpy(chunk).to("cuda")
+        batch = img_t.expand(len(chunk), -1, -1, -1)
+        warped = kornia.geometry.transform.warp_affine(
+            batch, m_t, dsize=(h, w), mode="bilinear"
+        )
+        out = warped.round().clamp_(0, 255).byte().permute(0, 2, 3, 1).cpu().numpy()
+        for j in range(len(chunk)):
+            name = specs[i + j][0]
+            _save_aug_image(out_img_dir, f"{stem}_{name}", out[j])
+            save_yolo_label(
+                out_lbl_dir / f"{stem}_{name}.txt",
+                *_geo_new_labels(
+                    chunk[j], w, h, bboxes_pascal, bboxes_cls, keypoints, poly_meta
+                ),
+            )
+            n_aug += 1
+    return n_aug
+
+
+# Per-process augmentation state. Populated by _init_augment_worker so each
+# pool worker constructs its transforms once instead of receiving pickled
+# Albumentations objects with every task.
+_WORKER_AUGS: dict[str, list[tuple[str, object]]] = {}
+
+
+def _init_augment_worker(
+    rot_step: int = 12, zoom_min: int = 40, img_format: str = "jpg", seed: int = 0
+) -> None:
+    _WORKER_AUGS["geo_specs"] = _build_geo_specs(rot_step, zoom_min)
+    _WORKER_AUGS["img_format"] = img_format
+    _WORKER_AUGS["seed"] = seed
+    # Everything that changes the augmented output, for the sidecar hashes.
+    _WORKER_AUGS["aug_key"] = f"{rot_step}:{zoom_min}:{img_format}:{seed}"
+    # Wrap each photometric aug in its A.Compose once per worker; building
+    # the compose per (image, aug) pair re-ran parameter validation
+    # thousands of times.
+    _WORKER_AUGS["photo"] = [
+        (name, A.Compose([aug])) for name, aug in _build_photo_augs()
+    ]
+    # libjpeg-turbo codec, one instance per worker; None when the native
+    # library is unavailable (helpers fall back to OpenCV).
+    _WORKER_AUGS["tj"] = None
+    if TurboJPEG is not None:
+        try:
+            _WORKER_AUGS["tj"] = TurboJPEG()
+        except OSError:
+            pass
+    # Small per-worker pool that turns each image write into a queued
+    # syscall instead of a blocking one; _flush_writes joins it per image.
+    _WORKER_AUGS["writer"] = ThreadPoolExecutor(max_workers=4)
+    _WORKER_AUGS["pending"] = []
+
+
+def _read_image(path: str) -> np.ndarray | None:
+    """Decode an image, using libjpeg-turbo for JPEGs when available."""
+    tj = _WORKER_AUGS.get("tj")
+    if tj is not None and path.lower().endswith((".jpg", ".jpeg")):
+        try:
+            with open(path, "rb") as f:
+                return tj.decode(f.read(), pixel_format=TJPF_BGR)
+        except (OSError, ValueError):
+            pass
+    return cv2.imread(path)
+
+
+def _encode_jpeg(img: np.ndarray) -> bytes:
+    """Encode a BGR image to JPEG bytes, using libjpeg-turbo when available."""
+    img = np.ascontiguousarray(img)
+    tj = _WORKER_AUGS.get("tj")
+    if tj is not None:
+        return tj.encode(img, quality=90, pixel_format=TJPF_BGR)
+    ok, buf = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    if not ok:
+        raise ValueError("JPEG encode failed")
+    return buf.tobytes()
+
+
+def _write_jpeg(path: str, img: np.ndarray) -> None:
+    """Encode a BGR image and write it to ``path``."""
+    with open(path, "wb") as f:
+        f.write(_encode_jpeg(img))
+
+
+def _write_bytes(path: str, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _save_aug_image(out_dir: Path, name: str, img: np.ndarray) -> None:
+    """
+    Write an augmented image in the configured intermediate format. "npy"
+    skips the JPEG encode (and the trainer-side decode) entirely for
+    same-host pipelines whose training loop can read raw arrays.
+
+    JPEGs are encoded in the caller (the encode must finish before the
+    reusable warp buffer is overwritten) but the disk write is handed to
+    the worker's writer pool so compute never waits on the filesystem;
+    _flush_writes() joins the outstanding writes.
+    """
+    if _WORKER_AUGS.get("img_format") == "npy":
+        np.save(str(out_dir / f"{name}.npy"), np.ascontiguousarray(img))
+        return
+    data = _encode_jpeg(img)
+    writer = _WORKER_AUGS.get("writer")
+    if writer is None:
+        _write_bytes(str(out_dir / f"{name}.jpg"), data)
+    else:
+        _WORKER_AUGS["pending"].append(
+            writer.submit(_write_bytes, str(out_dir / f"{name}.jpg"), data)
+        )
+
+
+def _flush_writes() -> None:
+    """Wait for every queued image write and surface any I/O error."""
+    pending = _WORKER_AUGS.get("pending")
+    if pending:
+        for fut in pending:
+            fut.result()
+        pending.clear()
+
+
+class _PrefetchGenerator:
+    """
+    Iterate (task, image) pairs with the image reads done by a background
+    thread, so JPEG decode overlaps with augmentation compute on the
+    single-process path (the process pool gets the same overlap for free
+    from having multiple workers).
+    """
+
+    def __init__(self, tasks: list[tuple[str, str, str, str]], maxsize: int = 32):
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(
+            target=self._reader, args=(tasks,), daemon=True
+        )
+        self._thread.start()
+
+    def _reader(self, tasks: list[tuple[str, str, str, str]]) -> None:
+        for task in tasks:
+            self._queue.put((task, _read_image(task[0])))
+        self._queue.put(None)
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            yield item
+
+
+def _augment_one(
+    task: tuple[str, str, str, str], image: np.ndarray | None = None
+) -> int:
+    """
+    Augment a single image: copy the original, then write every geometric
+    and photometric variant. Runs inside a process-pool worker; returns the
+    number of augmented images written. ``image`` lets a prefetcher hand
+    over an already-decoded frame.
+    """
+    img_path, lbl_dir, out_img_dir_s, out_lbl_dir_s = task
+    img_file = Path(img_path)
+    out_img_dir = Path(out_img_dir_s)
+    out_lbl_dir = Path(out_lbl_dir_s)
+    photo_augs = _WORKER_AUGS["photo"]
+
+    label_file = Path(lbl_dir) / (img_file.stem + ".txt")
+
+    # Content-addressed skip: the sidecar records a digest of the source
+    # bytes plus every augmentation parameter, so an unchanged image on an
+    # incremental rerun costs one hash instead of ~70 warps and encodes.
+    hash_path = out_lbl_dir / (img_file.stem + ".hash")
+    digest = hashlib.sha1(
+        img_file.read_bytes() + _WORKER_AUGS.get("aug_key", "").encode()
+    ).hexdigest()
+    if hash_path.exists():
+        stored = hash_path.read_text().split()
+        if len(stored) == 2 and stored[0] == digest:
+            return int(stored[1])
+
+    # Per-image seeding derived from (run seed, image stem) keeps every
+    # random augmentation parameter reproducible regardless of which
+    # worker picks the task up or in what order.
+    img_seed = (
+        zlib.crc32(img_file.stem.encode()) ^ (_WORKER_AUGS.get("seed", 0) * 0x9E3779B1)
+    ) & 0xFFFFFFFF
+    random.seed(img_seed)
+    np.random.seed(img_seed)
+
+    if image is None:
+        image = _read_image(str(img_file))
+    if image is None:
+        return 0
+    orig_h, orig_w = image.shape[:2]
+
+    if label_file.exists():
+        bboxes, poly_pts, poly_meta = parse_yolo_labels(label_file)
+    else:
+        bboxes = np.empty((0, 5), dtype=np.float32)
+        poly_pts = np.empty((0, 2), dtype=np.float32)
+        poly_meta = np.empty((0, 3), dtype=np.int32)
+
+    _fast_copy(str(img_file), str(out_img_dir / img_file.name))
+    if label_file.exists():
+        _fast_copy(str(label_file), str(out_lbl_dir / label_file.name))
+
+    n_aug = 0
+
+    # Absolute pixel coordinates for warping; classes stay in column 0.
+    bboxes_cls = bboxes[:, 0]
+    cx = bboxes[:, 1] * orig_w
+    cy = bboxes[:, 2] * orig_h
+    half_w = bboxes[:, 3] * orig_w / 2
+    half_h = bboxes[:, 4] * orig_h / 2
+    bboxes_pascal = np.stack(
+        [cx - half_w, cy - half_h, cx + half_w, cy + half_h], axis=1
+    )
+    keypoints = poly_pts * np.array([orig_w, orig_h], dtype=np.float32)
+
+    # 1) Geometric augmentations
+    if (len(bboxes_pascal) > 0 or len(keypoints) > 0) and _HAS_GPU_GEO:
+        n_aug += _augment_geo_gpu(
+            image,
+            img_file.stem,
+            out_img_dir,
+            out_lbl_dir,
+            bboxes_pascal,
+            bboxes_cls,
+            keypoints,
+            poly_meta,
+        )
+    elif len(bboxes_pascal) > 0 or len(keypoints) > 0:
+        # Each geometric spec collapses to one 2x3 matrix, so every output
+        # costs exactly one cv2.warpAffine (one interpolation) regardless
+        # of how many primitive steps the spec composes.
+        specs, mats = _geo_mats_for(orig_w, orig_h)
+        for (name, ops), m in zip(specs, mats):
+            aug_img = cv2.warpAffine(
+                image,
+                m,
+                (orig_w, orig_h),
+                dst=_warp_dst(orig_h, orig_w),
+                flags=cv2.INTER_LINEAR,
+                borderMode=_geo_border_mode(ops),
+            )
+            _save_aug_image(out_img_dir, f"{img_file.stem}_{name}", aug_img)
+            save_yolo_label(
+                out_lbl_dir / f"{img_file.stem}_{name}.txt",
+                *_geo_new_labels(
+                    m, orig_w, orig_h, bboxes_pascal, bboxes_cls, keypoints, poly_meta
+                ),
+            )
+            n_aug += 1
+
+    # 2) Photometric augmentations
+    for name, transform in photo_augs:
+        transformed = transform(image=image)
+        aug_img = transformed["image"]
+
+        _save_aug_image(out_img_dir, f"{img_file.stem}_{name}", aug_img)
+
+        # Photometric augmentations leave geometry untouched, so the parsed
+        # label arrays can be written back verbatim.
+        save_yolo_label(
+            out_lbl_dir / f"{img_file.stem}_{name}.txt", bboxes, poly_pts, poly_meta
+        )
+        n_aug += 1
+
+    # The sidecar must only exist once every image write has landed, so a
+    # crashed run cannot leave a hash that vouches for missing files.
+    _flush_writes()
+    hash_path.write_text(f"{digest} {n_aug}\n")
+    return n_aug
 
 
 def augment_dataset_noninteractive(
     input_dir: str,
     output_dir: str,
+    workers: int | None = None,
+    rot_step: int = 12,
+    zoom_min: int = 40,
+    intermediate_format: str = "jpg",
+    seed: int = 0,
 ) -> tuple[bool, dict]:
     """
     Logic copied from Product-detection/app.py::augment_dataset_streamlit,
     but without Streamlit and callbacks.
+
+    Each image is independent, so the per-image work is dispatched to a
+    process pool (``workers`` defaults to the CPU count). Existing outputs
+    are kept: per-image sidecar hashes let reruns skip images whose source
+    bytes and augmentation parameters have not changed.
     """
     try:
         input_path = Path(input_dir)
         output_path = Path(output_dir)
 
-        if output_path.exists():
-            shutil.rmtree(output_path)
-
         # Create output directories
         for split in ["train", "valid", "test"]:
             (output_path / split / "images").mkdir(parents=True, exist_ok=True)
             (output_path / split / "labels").mkdir(parents=True, exist_ok=True)
 
-        geo_augs = [
-            ("hflip", A.HorizontalFlip(p=1.0)),
-            ("vflip", A.VerticalFlip(p=1.0)),
-            ("rot90", A.Rotate(limit=(90, 90), p=1.0)),
-            ("rot180", A.Rotate(limit=(180, 180), p=1.0)),
-            ("rot270", A.Rotate(limit=(270, 270), p=1.0)),
-            ("shear_x15", A.Affine(shear={"x": 15, "y": 0}, p=1.0)),
-            ("shear_x-15", A.Affine(shear={"x": -15, "y": 0}, p=1.0)),
-            ("shear_y15", A.Affine(shear={"x": 0, "y": 15}, p=1.0)),
-            ("shear_y-15", A.Affine(shear={"x": 0, "y": -15}, p=1.0)),
-        ]
-
-        fine_rotations = [
-            (f"rot{i}", A.Rotate(limit=(i, i), p=1.0)) for i in range(12, 360, 12)
-        ]
-
-        zoom_outs = [
-            (f"zoom_{scale}", A.Affine(scale=scale / 100.0, p=1.0))
-            for scale in range(90, 30, -10)
-        ]
-
-        geo_augs = geo_augs + fine_rotations + zoom_outs
-
-        photo_augs = [
-            ("brightness_contrast", A.RandomBrightnessContrast(brightness_limit=0.2, contrast_limit=0.2, p=0.7)),
-            ("hsv_shift", A.HueSaturationValue(hue_shift_limit=15, sat_shift_limit=20, val_shift_limit=15, p=0.7)),
-            ("rgb_shift", A.RGBShift(r_shift_limit=15, g_shift_limit=15, b_shift_limit=15, p=0.5)),
-            ("clahe", A.CLAHE(clip_limit=2.0, tile_grid_size=(8, 8), p=0.3)),
-            ("gamma", A.RandomGamma(gamma_limit=(80, 120), p=0.5)),
-            ("motion_blur", A.MotionBlur(blur_limit=3, p=0.3)),
-            ("gauss_noise", A.GaussNoise(p=0.3)),
-            ("low_light", A.RandomBrightnessContrast(brightness_limit=(-0.6, -0.4), contrast_limit=(-0.4, -0.2), p=1.0)),
-            ("overexposed", A.RandomBrightnessContrast(brightness_limit=(0.4, 0.6), contrast_limit=(0.2, 0.4), p=1.0)),
-            (
-                "reflection_reduce",
-                A.Sequential(
-                    [
-                        A.MedianBlur(blur_limit=5, p=1.0),
-                        A.ColorJitter(
-                            brightness=0.3,
-                            contrast=0.3,
-                            saturation=0.3,
-                            hue=0.1,
-                            p=1.0,
-                        ),
-                    ],
-                    p=1.0,
-                ),
-            ),
-            ("low_res", A.Lambda(image=low_res, p=1.0)),
-        ]
+        max_workers = workers if workers is not None else (os.cpu_count() or 1)
 
         stats: dict = {
             "original_images": 0,
             "augmented_images": 0,
-            "total_augmentations": len(geo_augs) + len(photo_augs),
+            "total_augmentations": (
+                len(_build_geo_specs(rot_step, zoom_min)) + len(_build_photo_augs())
+            ),
             "splits": {},
         }
 
@@ -421,185 +1187,35 @@ def augment_dataset_noninteractive(
                 "augmented": 0,
             }
 
-            log(f"[Augment] {split}: {len(img_files)} images")
-
-            for img_file in img_files:
-                label_file = lbl_dir / (img_file.stem + ".txt")
-                image = cv2.imread(str(img_file))
-                if image is None:
-                    continue
-                orig_h, orig_w = image.shape[:2]
-
-                labels: list[dict] = []
-                if label_file.exists():
-                    with open(label_file, "r") as f:
-                        for line in f:
-                            if line.strip():
-                                labels.append(parse_yolo_label(line))
-
-                shutil.copy(str(img_file), str(out_img_dir / img_file.name))
-                if label_file.exists():
-                    shutil.copy(str(label_file), str(out_lbl_dir / label_file.name))
-
-                keypoints: list[tuple[float, float]] = []
-                keypoints_cls: list[int] = []
-                poly_splits: list[tuple[int, int, int]] = []
-                bboxes_pascal: list[list[float]] = []
-                bboxes_cls: list[int] = []
-
-                for lab in labels:
-                    if lab["bbox"] is not None:
-                        cx, cy, bw, bh = lab["bbox"]
-                        x1 = (cx - bw / 2) * orig_w
-                        y1 = (cy - bh / 2) * orig_h
-                        x2 = (cx + bw / 2) * orig_w
-                        y2 = (cy + bh / 2) * orig_h
-                        bboxes_pascal.append([x1, y1, x2, y2])
-                        bboxes_cls.append(lab["class"])
-                    elif lab["poly"] is not None:
-                        abs_poly = [(px * orig_w, py * orig_h) for px, py in lab["poly"]]
-                        start = len(keypoints)
-                        for pt in abs_poly:
-                            keypoints.append(pt)
-                            keypoints_cls.append(lab["class"])
-                        poly_splits.append((lab["class"], start, len(abs_poly)))
-
-                # 1) Geometric augmentations
-                if len(bboxes_pascal) > 0 or len(keypoints) > 0:
-                    for name, aug in geo_augs:
-                        transform = A.Compose(
-                            [aug],
-                            bbox_params=A.BboxParams(
-                                format="pascal_voc", label_fields=["bboxes_cls"]
-                            ),
-                            keypoint_params=A.KeypointParams(
-                                format="xy",
-                                remove_invisible=False,
-                                label_fields=["keypoints_cls"],
-                            ),
-                        )
-
-                        transformed = transform(
-                            image=image,
-                            bboxes=bboxes_pascal,
-                            bboxes_cls=bboxes_cls,
-                            keypoints=keypoints,
-                            keypoints_cls=keypoints_cls,
-                        )
-
-                        aug_img = transformed["image"]
-                        new_h, new_w = aug_img.shape[:2]
-
-                        new_labels: list[dict] = []
-                        for bbox, cls in zip(
-                            transformed["bboxes"], transformed["bboxes_cls"]
-                        ):
-                            x1, y1, x2, y2 = bbox
-                            cx = ((x1 + x2) / 2) / new_w
-                            cy = ((y1 + y2) / 2) / new_h
-                            bw = (x2 - x1) / new_w
-                            bh = (y2 - y1) / new_h
-                            new_labels.append(
-                                {
-                                    "class": cls,
-                                    "bbox": [cx, cy, bw, bh],
-                                    "poly": None,
-                                }
-                            )
-
-                        if poly_splits:
-                            polys = reconstruct_polygons_from_keypoints(
-                                transformed["keypoints"], poly_splits
-                            )
-                            for cls, pts in polys:
-                                norm = [
-                                    (
-                                        max(min(x / new_w, 1.0), 0.0),
-                                        max(min(y / new_h, 1.0), 0.0),
-                                    )
-                                    for x, y in pts
-                                ]
-                                if len(norm) >= 3:
-                                    new_labels.append(
-                                        {
-                                            "class": cls,
-                                            "bbox": None,
-                                            "poly": norm,
-                                        }
-                                    )
-                                else:
-                                    bbox_norm = polygon_to_bbox_norm(
-                                        [(x * new_w, y * new_h) for x, y in norm],
-                                        new_w,
-                                        new_h,
-                                    )
-                                    new_labels.append(
-                                        {
-                                            "class": cls,
-                                            "bbox": bbox_norm,
-                                            "poly": None,
-                                        }
-                                    )
-
-                        cv2.imwrite(
-                            str(out_img_dir / f"{img_file.stem}_{name}.jpg"), aug_img
-                        )
-                        save_yolo_label(
-                            out_lbl_dir / f"{img_file.stem}_{name}.txt", new_labels
-                        )
-                        split_stats["augmented"] += 1
-
-                # 2) Photometric augmentations
-                for name, aug in photo_augs:
-                    transform = A.Compose([aug])
-                    transformed = transform(image=image)
-                    aug_img = transformed["image"]
-                    new_h, new_w = aug_img.shape[:2]
-
-                    cv2.imwrite(
-                        str(out_img_dir / f"{img_file.stem}_{name}.jpg"), aug_img
+            log(f"[Augment] {split}: {len(img_files)} images ({max_workers} workers)")
+
+            tasks = [
+                (str(img_file), str(lbl_dir), str(out_img_dir), str(out_lbl_dir))
+                for img_file in img_files
+            ]
+
+            if max_workers > 1 and len(tasks) > 1:
+                # CUDA doesn't survive fork() — forked workers either die
+                # re-initializing it or each allocate a full context — so
+                # spawn the pool whenever the GPU geo path is active.
+                mp_context = (
+                    multiprocessing.get_context("spawn") if _HAS_GPU_GEO else None
+                )
+                with ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=mp_context,
+                    initializer=_init_augment_worker,
+                    initargs=(rot_step, zoom_min, intermediate_format, seed),
+                ) as executor:
+                    split_stats["augmented"] = sum(
+                        executor.map(_augment_one, tasks, chunksize=8)
                     )
-
-                    new_labels = []
-                    for bbox, cls in zip(bboxes_pascal, bboxes_cls):
-                        x1, y1, x2, y2 = bbox
-                        cx = ((x1 + x2) / 2) / new_w
-                        cy = ((y1 + y2) / 2) / new_h
-                        bw = (x2 - x1) / new_w
-                        bh = (y2 - y1) / new_h
-                        new_labels.append(
-                            {
-                                "class": cls,
-                                "bbox": [cx, cy, bw, bh],
-                                "poly": None,
-                            }
-                        )
-
-                    for cls, start, length in poly_splits:
-                        pts = keypoints[start : start + length]
-                        norm = [(x / new_w, y / new_h) for x, y in pts]
-                        if len(norm) >= 3:
-                            new_labels.append(
-                                {
-                                    "class": cls,
-                                    "bbox": None,
-                                    "poly": norm,
-                                }
-                            )
-                        else:
-                            bbox_norm = polygon_to_bbox_norm(pts, new_w, new_h)
-                            new_labels.append(
-                                {
-                                    "class": cls,
-                                    "bbox": bbox_norm,
-                                    "poly": None,
-                                }
-                            )
-
-                    save_yolo_label(
-                        out_lbl_dir / f"{img_file.stem}_{name}.txt", new_labels
-                    )
-                    split_stats["augmented"] += 1
+            else:
+                _init_augment_worker(rot_step, zoom_min, intermediate_format, seed)
+                split_stats["augmented"] = sum(
+                    _augment_one(task, image)
+                    for task, image in _PrefetchGenerator(tasks)
+                )
 
             stats["splits"][split] = split_stats
             stats["original_images"] += split_stats["original"]
@@ -638,7 +1254,7 @@ def augment_dataset_noninteractive(
         return False, {"error": str(exc)}
 
 
-def step_coco_to_yolo(coco_zip: Path, yolo_root: Path) -> Path:
+def step_coco_to_yolo(coco_zip: Path, yolo_root: Path, seed: int = 0) -> Path:
     """
     Convert COCO ZIP → YOLO dataset using the same logic as
     Product-detection/app.py (COCO to YOLO converter tab).
@@ -662,6 +1278,7 @@ def step_coco_to_yolo(coco_zip: Path, yolo_root: Path) -> Path:
         train_ratio=0.7,
         val_ratio=0.2,
         test_ratio=0.1,
+        seed=seed,
     )
     if not success:
         raise RuntimeError("COCO → YOLO conversion failed")
@@ -684,7 +1301,14 @@ def step_coco_to_yolo(coco_zip: Path, yolo_root: Path) -> Path:
     return dataset_yaml
 
 
-def step_augment_yolo(yolo_root: Path, aug_root: Path) -> Path:
+def step_augment_yolo(
+    yolo_root: Path,
+    aug_root: Path,
+    rot_step: int = 12,
+    zoom_min: int = 40,
+    intermediate_format: str = "jpg",
+    seed: int = 0,
+) -> Path:
     """
     Augment YOLO dataset using the same logic as
     Product-detection/app.py (Dataset Augmentation tab).
@@ -702,12 +1326,15 @@ def step_augment_yolo(yolo_root: Path, aug_root: Path) -> Path:
         )
 
     if aug_root.exists():
-        log(f"  Removing existing augmented dataset directory: {aug_root}")
-        shutil.rmtree(aug_root)
+        log(f"  Reusing existing augmented dataset directory: {aug_root}")
 
     success, stats = augment_dataset_noninteractive(
         input_dir=str(yolo_root),
         output_dir=str(aug_root),
+        rot_step=rot_step,
+        zoom_min=zoom_min,
+        intermediate_format=intermediate_format,
+        seed=seed,
     )
     if not success:
         raise RuntimeError(f"Augmentation failed: {stats.get('error')}")
@@ -725,6 +1352,35 @@ def step_augment_yolo(yolo_root: Path, aug_root: Path) -> Path:
     return aug_yaml
 
 
+def _install_early_stop(model: YOLO, patience: int, min_delta: float) -> None:
+    """
+    Swap Ultralytics' EarlyStopping for one with a min_delta dead band, so
+    noisy val curves don't reset the patience counter on trivial gains and
+    plateaued runs stop after ``patience`` epochs instead of running to
+    the epoch limit.
+    """
+    if min_delta <= 0:
+        return
+
+    from ultralytics.utils.torch_utils import EarlyStopping
+
+    class _MinDeltaStopper(EarlyStopping):
+        def __call__(self, epoch: int, fitness: float | None) -> bool:
+            if fitness is None:
+                return False
+            if fitness - self.best_fitness >= min_delta or not self.best_fitness:
+                self.best_epoch = epoch
+                self.best_fitness = fitness
+            delta = epoch - self.best_epoch
+            self.possible_stop = delta >= (self.patience - 1)
+            return delta >= self.patience
+
+    def _swap_stopper(trainer) -> None:
+        trainer.stopper = _MinDeltaStopper(patience=patience)
+
+    model.add_callback("on_train_start", _swap_stopper)
+
+
 def step_train(
     base_model_path: Path,
     data_yaml: Path,
@@ -734,6 +1390,7 @@ def step_train(
     batch: int,
     imgsz: int,
     device: str,
+    min_delta: float = 1e-4,
 ) -> Path:
     """
     Train YOLO model on the augmented dataset.
@@ -759,6 +1416,7 @@ def step_train(
     run_name = f"train_{timestamp}"
 
     model = YOLO(str(base_model_path))
+    _install_early_stop(model, patience, min_delta)
 
     results = model.train(
         data=str(data_yaml),
@@ -782,6 +1440,10 @@ def step_train(
         name=run_name,
         exist_ok=True,
         verbose=True,
+        # No periodic checkpoints or plot renders while a stalled run
+        # waits out its patience window.
+        plots=False,
+        save_period=-1,
     )
 
     save_dir = Path(results.save_dir)
@@ -844,10 +1506,17 @@ def main() -> None:
     aug_root = work_dir / "dataset" / "yolo_aug"
 
     # 1. COCO → YOLO
-    dataset_yaml = step_coco_to_yolo(coco_zip, yolo_root)
+    dataset_yaml = step_coco_to_yolo(coco_zip, yolo_root, seed=args.seed)
 
     # 2. Augmentation
-    aug_yaml = step_augment_yolo(yolo_root, aug_root)
+    aug_yaml = step_augment_yolo(
+        yolo_root,
+        aug_root,
+        rot_step=args.rot_step,
+        zoom_min=args.zoom_min,
+        intermediate_format=args.intermediate_format,
+        seed=args.seed,
+    )
 
     # 3. Training
     best_model_path = step_train(
@@ -859,6 +1528,7 @@ def main() -> None:
         batch=args.batch,
         imgsz=args.imgsz,
         device=args.device,
+        min_delta=args.min_delta,
     )
 
     # 4. TFLite export
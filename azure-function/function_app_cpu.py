@@ -3,58 +3,228 @@ Azure Function - CPU Version (for Student Accounts)
 Modified to work without GPU requirements
 """
 
+import hashlib
 import json
 import logging
 import os
+import re
+import threading
 import uuid
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
 
 import azure.functions as func
-from azure.identity import DefaultAzureCredential
-from azure.mgmt.containerinstance import ContainerInstanceManagementClient
-from azure.mgmt.containerinstance.models import (
-    AzureFileVolume,
-    Container,
-    ContainerGroup,
-    ContainerGroupRestartPolicy,
-    EnvironmentVariable,
-    ImageRegistryCredential,
-    OperatingSystemTypes,
-    ResourceRequests,
-    ResourceRequirements,
-    Volume,
-    VolumeMount,
-)
+
+# azure.identity and azure.mgmt.containerinstance pull in a heavy
+# dependency tree; they are imported lazily inside _get_aci_client /
+# create_container_group so cold starts only pay for what the first
+# request actually touches.
 
 app = func.FunctionApp()
 
-# Configuration from environment variables
-SUBSCRIPTION_ID = os.environ["AZURE_SUBSCRIPTION_ID"]
-RESOURCE_GROUP = os.environ["AZURE_RESOURCE_GROUP"]
-LOCATION = os.environ.get("AZURE_LOCATION", "eastus")
+# orjson's C serializer is 2-10x faster than stdlib json for the multi-KB
+# log bodies this app returns; fall back quietly so it stays optional.
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
 
-# Azure Container Registry
-ACR_LOGIN_SERVER = os.environ["ACR_LOGIN_SERVER"]
-ACR_USERNAME = os.environ.get("ACR_USERNAME")
-ACR_PASSWORD = os.environ.get("ACR_PASSWORD")
-TRAINING_IMAGE = os.environ["TRAINING_IMAGE"]
+except ImportError:
 
-# Azure Files Storage
-STORAGE_ACCOUNT_NAME = os.environ["STORAGE_ACCOUNT_NAME"]
-STORAGE_ACCOUNT_KEY = os.environ["STORAGE_ACCOUNT_KEY"]
-DATASET_SHARE_NAME = os.environ.get("DATASET_SHARE_NAME", "datasets")
-MODEL_SHARE_NAME = os.environ.get("MODEL_SHARE_NAME", "models")
-OUTPUT_SHARE_NAME = os.environ.get("OUTPUT_SHARE_NAME", "outputs")
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
 
-# Training defaults (smaller for CPU testing)
-DEFAULT_EPOCHS = int(os.environ.get("DEFAULT_EPOCHS", "5"))
-DEFAULT_PATIENCE = int(os.environ.get("DEFAULT_PATIENCE", "3"))
-DEFAULT_BATCH = int(os.environ.get("DEFAULT_BATCH", "8"))
-DEFAULT_IMGSZ = int(os.environ.get("DEFAULT_IMGSZ", "320"))
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """All environment-derived settings, read and validated once at import.
+
+    Failing at cold start with the full list of missing variables beats a
+    KeyError surfacing on the first request, and handlers read plain
+    attributes instead of hashing into os.environ per invocation.
+    """
+
+    subscription_id: str
+    resource_group: str
+    location: str
+    acr_login_server: str
+    acr_username: str
+    acr_password: str
+    training_image: str
+    storage_account_name: str
+    storage_account_key: str
+    dataset_share_name: str
+    model_share_name: str
+    output_share_name: str
+    default_epochs: int
+    default_patience: int
+    default_batch: int
+    default_imgsz: int
+    function_app_url: str
+
+    @classmethod
+    def from_env(cls) -> "Config":
+        required = (
+            "AZURE_SUBSCRIPTION_ID",
+            "AZURE_RESOURCE_GROUP",
+            "ACR_LOGIN_SERVER",
+            "TRAINING_IMAGE",
+            "STORAGE_ACCOUNT_NAME",
+            "STORAGE_ACCOUNT_KEY",
+        )
+        missing = [name for name in required if not os.environ.get(name)]
+        if missing:
+            raise RuntimeError(
+                f"Missing required environment variables: {', '.join(missing)}"
+            )
+
+        return cls(
+            subscription_id=os.environ["AZURE_SUBSCRIPTION_ID"],
+            resource_group=os.environ["AZURE_RESOURCE_GROUP"],
+            location=os.environ.get("AZURE_LOCATION", "eastus"),
+            acr_login_server=os.environ["ACR_LOGIN_SERVER"],
+            acr_username=os.environ.get("ACR_USERNAME", ""),
+            acr_password=os.environ.get("ACR_PASSWORD", ""),
+            training_image=os.environ["TRAINING_IMAGE"],
+            storage_account_name=os.environ["STORAGE_ACCOUNT_NAME"],
+            storage_account_key=os.environ["STORAGE_ACCOUNT_KEY"],
+            dataset_share_name=os.environ.get("DATASET_SHARE_NAME", "datasets"),
+            model_share_name=os.environ.get("MODEL_SHARE_NAME", "models"),
+            output_share_name=os.environ.get("OUTPUT_SHARE_NAME", "outputs"),
+            # Training defaults (smaller for CPU testing)
+            default_epochs=int(os.environ.get("DEFAULT_EPOCHS", "5")),
+            default_patience=int(os.environ.get("DEFAULT_PATIENCE", "3")),
+            default_batch=int(os.environ.get("DEFAULT_BATCH", "8")),
+            default_imgsz=int(os.environ.get("DEFAULT_IMGSZ", "320")),
+            function_app_url=os.environ.get(
+                "FUNCTION_APP_URL", "https://your-function-app.azurewebsites.net"
+            ),
+        )
+
+
+CONFIG = Config.from_env()
 
 
 logger = logging.getLogger(__name__)
 
+# Allowed characters for Azure Files paths supplied by callers; anything
+# else (and any "..") is rejected before it reaches a container command.
+_PATH_RE = re.compile(r"[\w./\-]{1,256}")
+
+# Job IDs are the first 8 hex chars of a uuid4; rejecting anything else
+# up front saves an ARM round-trip on garbage route params.
+_JOB_ID_RE = re.compile(r"[0-9a-f]{8}")
+
+# Constant 400 bodies, serialized once — these fire on every call from a
+# misconfigured client, so skip re-encoding the same dict each time.
+_ERR_INVALID_JSON = _dumps({"error": "Invalid JSON in request body"})
+_ERR_MISSING_FIELDS = _dumps(
+    {"error": "Missing required fields: coco_zip_path, base_model_path"}
+)
+_ERR_BAD_PARAMS = _dumps(
+    {"error": "epochs, patience, batch and imgsz must be integers"}
+)
+_ERR_MISSING_JOB_ID = _dumps({"error": "Missing job_id"})
+_ERR_INVALID_JOB_ID = _dumps({"error": "Invalid job_id"})
+
+# The Python worker is reused across invocations, so build the credential
+# (whose DefaultAzureCredential probe chain does several I/O round-trips)
+# and the management client (HTTP pipeline + TLS session) once per warm
+# instance instead of per request.
+_credential = None
+_aci_client = None
+_client_lock = threading.Lock()
+
+# created_at is written into the tags at creation and never changes, so
+# remember it per job after the first poll instead of probing the tags
+# dict on every full ARM payload; evicted on cleanup.
+_tag_cache: dict = {}
+
+# The volume/mount/registry definitions are identical for every job —
+# only the output path inside the command line is per-job — so build the
+# SDK model objects once, on first use, instead of per request.
+_static_parts = None
+
+
+def _get_static_parts():
+    """Return the shared (volumes, mounts, registry_credentials) tuple."""
+    global _static_parts
+    if _static_parts is None:
+        from azure.mgmt.containerinstance.models import (
+            AzureFileVolume,
+            ImageRegistryCredential,
+            Volume,
+            VolumeMount,
+        )
+
+        volumes = [
+            Volume(
+                name="datasets",
+                azure_file=AzureFileVolume(
+                    share_name=CONFIG.dataset_share_name,
+                    storage_account_name=CONFIG.storage_account_name,
+                    storage_account_key=CONFIG.storage_account_key,
+                ),
+            ),
+            Volume(
+                name="models",
+                azure_file=AzureFileVolume(
+                    share_name=CONFIG.model_share_name,
+                    storage_account_name=CONFIG.storage_account_name,
+                    storage_account_key=CONFIG.storage_account_key,
+                ),
+            ),
+            Volume(
+                name="outputs",
+                azure_file=AzureFileVolume(
+                    share_name=CONFIG.output_share_name,
+                    storage_account_name=CONFIG.storage_account_name,
+                    storage_account_key=CONFIG.storage_account_key,
+                ),
+            ),
+        ]
+
+        mounts = [
+            VolumeMount(name="datasets", mount_path="/mnt/datasets", read_only=True),
+            VolumeMount(name="models", mount_path="/mnt/models", read_only=True),
+            VolumeMount(name="outputs", mount_path="/mnt/outputs", read_only=False),
+        ]
+
+        registry_credentials = (
+            [
+                ImageRegistryCredential(
+                    server=CONFIG.acr_login_server,
+                    username=CONFIG.acr_username,
+                    password=CONFIG.acr_password,
+                )
+            ]
+            if CONFIG.acr_username and CONFIG.acr_password
+            else None
+        )
+
+        _static_parts = (volumes, mounts, registry_credentials)
+    return _static_parts
+
+
+def _get_aci_client():
+    """Return the shared ContainerInstanceManagementClient, building it once."""
+    global _credential, _aci_client
+    if _aci_client is None:
+        with _client_lock:
+            if _aci_client is None:
+                from azure.identity import DefaultAzureCredential
+                from azure.mgmt.containerinstance import (
+                    ContainerInstanceManagementClient,
+                )
+
+                _credential = DefaultAzureCredential()
+                _aci_client = ContainerInstanceManagementClient(
+                    _credential, CONFIG.subscription_id
+                )
+    return _aci_client
+
 
 def create_container_group(
     job_id: str,
@@ -64,48 +234,27 @@ def create_container_group(
     patience: int,
     batch: int,
     imgsz: int,
-) -> ContainerGroup:
+):
     """
     Create an Azure Container Instance with CPU for training.
     (Modified for student accounts - no GPU)
     """
+    from azure.mgmt.containerinstance.models import (
+        Container,
+        ContainerGroup,
+        ContainerGroupRestartPolicy,
+        EnvironmentVariable,
+        OperatingSystemTypes,
+        ResourceRequests,
+        ResourceRequirements,
+    )
+
     container_group_name = f"training-{job_id}"
-    
-    # Define volumes
-    volumes = [
-        Volume(
-            name="datasets",
-            azure_file=AzureFileVolume(
-                share_name=DATASET_SHARE_NAME,
-                storage_account_name=STORAGE_ACCOUNT_NAME,
-                storage_account_key=STORAGE_ACCOUNT_KEY,
-            ),
-        ),
-        Volume(
-            name="models",
-            azure_file=AzureFileVolume(
-                share_name=MODEL_SHARE_NAME,
-                storage_account_name=STORAGE_ACCOUNT_NAME,
-                storage_account_key=STORAGE_ACCOUNT_KEY,
-            ),
-        ),
-        Volume(
-            name="outputs",
-            azure_file=AzureFileVolume(
-                share_name=OUTPUT_SHARE_NAME,
-                storage_account_name=STORAGE_ACCOUNT_NAME,
-                storage_account_key=STORAGE_ACCOUNT_KEY,
-            ),
-        ),
-    ]
-    
-    # Define volume mounts
-    volume_mounts = [
-        VolumeMount(name="datasets", mount_path="/mnt/datasets", read_only=True),
-        VolumeMount(name="models", mount_path="/mnt/models", read_only=True),
-        VolumeMount(name="outputs", mount_path="/mnt/outputs", read_only=False),
-    ]
-    
+    volumes, volume_mounts, registry_credentials = _get_static_parts()
+    # One timestamp for both the env var and the tag, so downstream log
+    # correlation sees the same instant (utcnow is also deprecated).
+    now_iso = datetime.now(timezone.utc).isoformat()
+
     # Container command arguments (device=cpu instead of 0)
     command = [
         "--coco-zip", f"/mnt/datasets/{coco_zip_path}",
@@ -122,7 +271,7 @@ def create_container_group(
     # Environment variables
     environment_variables = [
         EnvironmentVariable(name="JOB_ID", value=job_id),
-        EnvironmentVariable(name="STARTED_AT", value=datetime.utcnow().isoformat()),
+        EnvironmentVariable(name="STARTED_AT", value=now_iso),
     ]
     
     # CPU-only resource requirements (no GPU)
@@ -136,134 +285,140 @@ def create_container_group(
     # Container definition
     container = Container(
         name="trainer",
-        image=TRAINING_IMAGE,
+        image=CONFIG.training_image,
         resources=resource_requirements,
         command=command,
         volume_mounts=volume_mounts,
         environment_variables=environment_variables,
     )
-    
-    # Image registry credentials
-    image_registry_credentials = None
-    if ACR_USERNAME and ACR_PASSWORD:
-        image_registry_credentials = [
-            ImageRegistryCredential(
-                server=ACR_LOGIN_SERVER,
-                username=ACR_USERNAME,
-                password=ACR_PASSWORD,
-            )
-        ]
-    
+
     # Container group
     container_group = ContainerGroup(
-        location=LOCATION,
+        location=CONFIG.location,
         containers=[container],
         os_type=OperatingSystemTypes.linux,
         restart_policy=ContainerGroupRestartPolicy.never,
         volumes=volumes,
-        image_registry_credentials=image_registry_credentials,
+        image_registry_credentials=registry_credentials,
         tags={
             "job_id": job_id,
             "purpose": "yolo-training-cpu",
-            "created_at": datetime.utcnow().isoformat(),
+            "created_at": now_iso,
         },
     )
     
     return container_group_name, container_group
 
 
+def _parse_job_params(body: dict):
+    """Validate one training-job spec.
+
+    Returns (params, None) on success or (None, error_bytes) where
+    error_bytes is a ready-to-send 400 body.
+    """
+    coco_zip_path = body.get("coco_zip_path")
+    base_model_path = body.get("base_model_path")
+
+    if not coco_zip_path or not base_model_path:
+        return None, _ERR_MISSING_FIELDS
+
+    for path in (coco_zip_path, base_model_path):
+        if not isinstance(path, str) or not _PATH_RE.fullmatch(path) or ".." in path:
+            return None, _dumps({"error": f"Invalid path: {path!r}"})
+
+    # Clamp to sane bounds so a typo'd epochs=1e9 or imgsz=100000 can't
+    # pin a container for weeks.
+    try:
+        epochs = max(1, min(int(body.get("epochs", CONFIG.default_epochs)), 1000))
+        patience = max(1, min(int(body.get("patience", CONFIG.default_patience)), 1000))
+        batch = max(1, min(int(body.get("batch", CONFIG.default_batch)), 256))
+        imgsz = max(64, min(int(body.get("imgsz", CONFIG.default_imgsz)), 2048))
+    except (TypeError, ValueError):
+        return None, _ERR_BAD_PARAMS
+
+    return {
+        "coco_zip_path": coco_zip_path,
+        "base_model_path": base_model_path,
+        "epochs": epochs,
+        "patience": patience,
+        "batch": batch,
+        "imgsz": imgsz,
+    }, None
+
+
+def _launch_training_job(aci_client, params: dict) -> dict:
+    """Create a container group for one validated job spec.
+
+    Doesn't block on the poller: ACI provisioning takes 30-180s and the
+    caller polls /status/{job_id} anyway. Returning as soon as ARM
+    accepts the create keeps the request sub-second and stops a Function
+    instance being pinned per training job.
+    """
+    job_id = str(uuid.uuid4())[:8]
+    logger.info(f"Creating CPU training job {job_id}")
+
+    container_group_name, container_group = create_container_group(
+        job_id=job_id, **params
+    )
+
+    logger.info(f"Deploying container group: {container_group_name}")
+    aci_client.container_groups.begin_create_or_update(
+        CONFIG.resource_group,
+        container_group_name,
+        container_group,
+        polling_interval=5,
+    )
+
+    return {
+        "job_id": job_id,
+        "status": "creating",
+        "container_group_name": container_group_name,
+        "status_url": f"{CONFIG.function_app_url}/api/status/{job_id}",
+        "parameters": dict(params, device="cpu"),
+    }
+
+
 @app.route(route="train", methods=["POST"], auth_level=func.AuthLevel.FUNCTION)
 def trigger_training(req: func.HttpRequest) -> func.HttpResponse:
     """HTTP trigger to start a training job."""
     logger.info("Training trigger function received request")
-    
+
     try:
         req_body = req.get_json()
     except ValueError:
         return func.HttpResponse(
-            json.dumps({"error": "Invalid JSON in request body"}),
+            _ERR_INVALID_JSON,
             status_code=400,
             mimetype="application/json",
         )
-    
-    # Validate required fields
-    coco_zip_path = req_body.get("coco_zip_path")
-    base_model_path = req_body.get("base_model_path")
-    
-    if not coco_zip_path or not base_model_path:
+
+    params, error = _parse_job_params(req_body)
+    if error:
         return func.HttpResponse(
-            json.dumps({
-                "error": "Missing required fields: coco_zip_path, base_model_path"
-            }),
+            error,
             status_code=400,
             mimetype="application/json",
         )
-    
-    # Get parameters with defaults
-    epochs = req_body.get("epochs", DEFAULT_EPOCHS)
-    patience = req_body.get("patience", DEFAULT_PATIENCE)
-    batch = req_body.get("batch", DEFAULT_BATCH)
-    imgsz = req_body.get("imgsz", DEFAULT_IMGSZ)
-    
-    # Generate unique job ID
-    job_id = str(uuid.uuid4())[:8]
-    
-    logger.info(f"Creating CPU training job {job_id}")
-    
+
     try:
-        credential = DefaultAzureCredential()
-        aci_client = ContainerInstanceManagementClient(credential, SUBSCRIPTION_ID)
-        
-        container_group_name, container_group = create_container_group(
-            job_id=job_id,
-            coco_zip_path=coco_zip_path,
-            base_model_path=base_model_path,
-            epochs=epochs,
-            patience=patience,
-            batch=batch,
-            imgsz=imgsz,
-        )
-        
-        logger.info(f"Deploying container group: {container_group_name}")
-        poller = aci_client.container_groups.begin_create_or_update(
-            RESOURCE_GROUP,
-            container_group_name,
-            container_group,
+        aci_client = _get_aci_client()
+
+        response_data = _launch_training_job(aci_client, params)
+        response_data["message"] = "CPU training job started successfully"
+        response_data["note"] = (
+            "This is CPU-only training (slower but works on student accounts)"
         )
-        
-        result = poller.result()
-        
-        function_app_url = os.environ.get("FUNCTION_APP_URL", "https://your-function-app.azurewebsites.net")
-        status_url = f"{function_app_url}/api/status/{job_id}"
-        
-        response_data = {
-            "job_id": job_id,
-            "status": result.provisioning_state.lower(),
-            "container_group_name": container_group_name,
-            "status_url": status_url,
-            "message": "CPU training job started successfully",
-            "note": "This is CPU-only training (slower but works on student accounts)",
-            "parameters": {
-                "coco_zip_path": coco_zip_path,
-                "base_model_path": base_model_path,
-                "epochs": epochs,
-                "patience": patience,
-                "batch": batch,
-                "imgsz": imgsz,
-                "device": "cpu"
-            },
-        }
-        
+
         return func.HttpResponse(
-            json.dumps(response_data),
+            _dumps(response_data),
             status_code=202,
             mimetype="application/json",
         )
-        
+
     except Exception as e:
         logger.error(f"Failed to create training job: {str(e)}", exc_info=True)
         return func.HttpResponse(
-            json.dumps({
+            _dumps({
                 "error": "Failed to create training job",
                 "details": str(e),
             }),
@@ -272,75 +427,180 @@ def trigger_training(req: func.HttpRequest) -> func.HttpResponse:
         )
 
 
+@app.route(route="train/batch", methods=["POST"], auth_level=func.AuthLevel.FUNCTION)
+def trigger_training_batch(req: func.HttpRequest) -> func.HttpResponse:
+    """Start several training jobs from one request.
+
+    Hyper-parameter sweeps were starting jobs one HTTP call at a time;
+    here the ARM create calls are issued in parallel so N jobs launch in
+    roughly the wall time of one, through a single warm client.
+    """
+    logger.info("Batch training trigger function received request")
+
+    try:
+        req_body = req.get_json()
+    except ValueError:
+        return func.HttpResponse(
+            _ERR_INVALID_JSON,
+            status_code=400,
+            mimetype="application/json",
+        )
+
+    jobs = req_body.get("jobs")
+    if not isinstance(jobs, list) or not jobs:
+        return func.HttpResponse(
+            _dumps({"error": "Body must contain a non-empty 'jobs' list"}),
+            status_code=400,
+            mimetype="application/json",
+        )
+
+    # Validate everything up front so a bad spec rejects the whole batch
+    # before any container group is created.
+    parsed = []
+    for index, job in enumerate(jobs):
+        params, error = _parse_job_params(job if isinstance(job, dict) else {})
+        if error:
+            return func.HttpResponse(
+                _dumps({
+                    "error": f"Invalid job at index {index}",
+                    "details": json.loads(error),
+                }),
+                status_code=400,
+                mimetype="application/json",
+            )
+        parsed.append(params)
+
+    try:
+        aci_client = _get_aci_client()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(
+                pool.map(lambda params: _launch_training_job(aci_client, params), parsed)
+            )
+
+        return func.HttpResponse(
+            _dumps({"jobs": results}),
+            status_code=202,
+            mimetype="application/json",
+        )
+
+    except Exception as e:
+        logger.error(f"Failed to create training batch: {str(e)}", exc_info=True)
+        return func.HttpResponse(
+            _dumps({
+                "error": "Failed to create training batch",
+                "details": str(e),
+            }),
+            status_code=500,
+            mimetype="application/json",
+        )
+
+
+def _build_status_payload(job_id: str, container_group) -> dict:
+    """Derive the status response dict for a container group."""
+    # Walk the containers[0].instance_view.current_state chain once into
+    # locals; each attribute hop on the SDK models is a descriptor lookup
+    # and this runs on every poll of every job.
+    containers = container_group.containers or ()
+    instance_view = containers[0].instance_view if containers else None
+    current_state = instance_view.current_state if instance_view else None
+    container_state, exit_code = (
+        (current_state.state, current_state.exit_code) if current_state else (None, None)
+    )
+    provisioning_state = container_group.provisioning_state
+
+    created_at = _tag_cache.get(job_id)
+    if created_at is None:
+        tags = container_group.tags
+        created_at = tags.get("created_at") if tags else None
+        if created_at is not None:
+            _tag_cache[job_id] = created_at
+
+    response_data = {
+        "job_id": job_id,
+        "provisioning_state": provisioning_state,
+        "container_state": container_state,
+        "exit_code": exit_code,
+        "output_path": f"/mnt/outputs/tflite/{job_id}",
+        "created_at": created_at,
+    }
+
+    if provisioning_state == "Succeeded":
+        if container_state == "Terminated":
+            if exit_code == 0:
+                response_data["status"] = "completed"
+                response_data["message"] = "Training completed successfully"
+            else:
+                response_data["status"] = "failed"
+                response_data["message"] = f"Training failed with exit code {exit_code}"
+        else:
+            response_data["status"] = "running"
+            response_data["message"] = "Training in progress"
+    elif provisioning_state == "Failed":
+        response_data["status"] = "failed"
+        response_data["message"] = "Container provisioning failed"
+    else:
+        response_data["status"] = "provisioning"
+        response_data["message"] = "Container is being provisioned"
+
+    return response_data
+
+
 @app.route(route="status/{job_id}", methods=["GET"], auth_level=func.AuthLevel.FUNCTION)
 def get_training_status(req: func.HttpRequest) -> func.HttpResponse:
     """Get the status of a training job."""
     job_id = req.route_params.get("job_id")
-    
+
     if not job_id:
         return func.HttpResponse(
-            json.dumps({"error": "Missing job_id"}),
+            _ERR_MISSING_JOB_ID,
             status_code=400,
             mimetype="application/json",
         )
-    
+    if not _JOB_ID_RE.fullmatch(job_id):
+        return func.HttpResponse(
+            _ERR_INVALID_JOB_ID,
+            status_code=400,
+            mimetype="application/json",
+        )
+
     container_group_name = f"training-{job_id}"
-    
+
     try:
-        credential = DefaultAzureCredential()
-        aci_client = ContainerInstanceManagementClient(credential, SUBSCRIPTION_ID)
-        
+        aci_client = _get_aci_client()
+
         container_group = aci_client.container_groups.get(
-            RESOURCE_GROUP,
+            CONFIG.resource_group,
             container_group_name,
         )
-        
-        container_state = None
-        exit_code = None
-        
-        if container_group.containers and container_group.containers[0].instance_view:
-            current_state = container_group.containers[0].instance_view.current_state
-            if current_state:
-                container_state = current_state.state
-                exit_code = current_state.exit_code
-        
-        response_data = {
-            "job_id": job_id,
-            "provisioning_state": container_group.provisioning_state,
-            "container_state": container_state,
-            "exit_code": exit_code,
-            "output_path": f"/mnt/outputs/tflite/{job_id}",
-            "created_at": container_group.tags.get("created_at") if container_group.tags else None,
-        }
-        
-        if container_group.provisioning_state == "Succeeded":
-            if container_state == "Terminated":
-                if exit_code == 0:
-                    response_data["status"] = "completed"
-                    response_data["message"] = "Training completed successfully"
-                else:
-                    response_data["status"] = "failed"
-                    response_data["message"] = f"Training failed with exit code {exit_code}"
-            else:
-                response_data["status"] = "running"
-                response_data["message"] = "Training in progress"
-        elif container_group.provisioning_state == "Failed":
-            response_data["status"] = "failed"
-            response_data["message"] = "Container provisioning failed"
-        else:
-            response_data["status"] = "provisioning"
-            response_data["message"] = "Container is being provisioned"
-        
+
+        response_data = _build_status_payload(job_id, container_group)
+
+        # Most polls see an unchanged state; an ETag over the fields that
+        # can actually move lets the client skip body transfer (and us
+        # skip serialization) until something transitions.
+        etag = hashlib.md5(
+            (
+                f"{response_data['provisioning_state']}"
+                f"|{response_data['container_state']}"
+                f"|{response_data['exit_code']}"
+            ).encode()
+        ).hexdigest()
+
+        if req.headers.get("If-None-Match") == etag:
+            return func.HttpResponse(status_code=304, headers={"ETag": etag})
+
         return func.HttpResponse(
-            json.dumps(response_data),
+            _dumps(response_data),
             status_code=200,
             mimetype="application/json",
+            headers={"ETag": etag},
         )
-        
+
     except Exception as e:
         logger.error(f"Failed to get status for job {job_id}: {str(e)}", exc_info=True)
         return func.HttpResponse(
-            json.dumps({
+            _dumps({
                 "error": "Failed to get training status",
                 "details": str(e),
             }),
@@ -349,53 +609,150 @@ def get_training_status(req: func.HttpRequest) -> func.HttpResponse:
         )
 
 
+@app.route(route="job/{job_id}", methods=["GET"], auth_level=func.AuthLevel.FUNCTION)
+def get_job(req: func.HttpRequest) -> func.HttpResponse:
+    """Get status and (optionally) logs of a training job in one call.
+
+    Combining the two lookups halves the round-trips a monitoring client
+    makes: ordinary polls pass no query params and behave like /status,
+    while the final poll adds ?include_logs=true&tail=N to pick up the
+    logs without a second Function invocation.
+    """
+    job_id = req.route_params.get("job_id")
+    include_logs = req.params.get("include_logs", "").lower() in ("1", "true", "yes")
+    tail = req.params.get("tail", "1000")
+
+    if not job_id:
+        return func.HttpResponse(
+            _ERR_MISSING_JOB_ID,
+            status_code=400,
+            mimetype="application/json",
+        )
+    if not _JOB_ID_RE.fullmatch(job_id):
+        return func.HttpResponse(
+            _ERR_INVALID_JOB_ID,
+            status_code=400,
+            mimetype="application/json",
+        )
+
+    try:
+        tail = int(tail)
+    except ValueError:
+        tail = 1000
+
+    container_group_name = f"training-{job_id}"
+
+    try:
+        aci_client = _get_aci_client()
+
+        container_group = aci_client.container_groups.get(
+            CONFIG.resource_group,
+            container_group_name,
+        )
+
+        response_data = _build_status_payload(job_id, container_group)
+
+        if include_logs:
+            try:
+                logs = aci_client.containers.list_logs(
+                    CONFIG.resource_group,
+                    container_group_name,
+                    "trainer",
+                    tail=tail,
+                )
+                response_data["logs"] = logs.content
+                response_data["tail"] = tail
+            except Exception as log_error:
+                # Logs may not exist yet (container still provisioning);
+                # the status half of the response is still useful.
+                logger.warning(f"Failed to get logs for job {job_id}: {str(log_error)}")
+                response_data["logs"] = None
+
+        return func.HttpResponse(
+            _dumps(response_data),
+            status_code=200,
+            mimetype="application/json",
+        )
+
+    except Exception as e:
+        logger.error(f"Failed to get job {job_id}: {str(e)}", exc_info=True)
+        return func.HttpResponse(
+            _dumps({
+                "error": "Failed to get training job",
+                "details": str(e),
+            }),
+            status_code=500,
+            mimetype="application/json",
+        )
+
+
 @app.route(route="logs/{job_id}", methods=["GET"], auth_level=func.AuthLevel.FUNCTION)
 def get_training_logs(req: func.HttpRequest) -> func.HttpResponse:
     """Get the logs of a training job."""
     job_id = req.route_params.get("job_id")
     tail = req.params.get("tail", "1000")
-    
+    raw = req.params.get("format") == "raw"
+
     if not job_id:
         return func.HttpResponse(
-            json.dumps({"error": "Missing job_id"}),
+            _ERR_MISSING_JOB_ID,
             status_code=400,
             mimetype="application/json",
         )
-    
+    if not _JOB_ID_RE.fullmatch(job_id):
+        return func.HttpResponse(
+            _ERR_INVALID_JOB_ID,
+            status_code=400,
+            mimetype="application/json",
+        )
+
     try:
         tail = int(tail)
     except ValueError:
         tail = 1000
-    
+
     container_group_name = f"training-{job_id}"
-    
+
     try:
-        credential = DefaultAzureCredential()
-        aci_client = ContainerInstanceManagementClient(credential, SUBSCRIPTION_ID)
-        
+        aci_client = _get_aci_client()
+
         logs = aci_client.containers.list_logs(
-            RESOURCE_GROUP,
+            CONFIG.resource_group,
             container_group_name,
             "trainer",
             tail=tail,
         )
-        
-        response_data = {
-            "job_id": job_id,
-            "logs": logs.content,
-            "tail": tail,
-        }
-        
+        content = logs.content or ""
+
+        # ?format=raw skips JSON escaping entirely — the log body goes
+        # out as-is, with no extra copy. Preferred for large tails.
+        if raw:
+            return func.HttpResponse(
+                content,
+                status_code=200,
+                mimetype="text/plain",
+            )
+
+        # Splice the envelope around one escaped copy of the log body
+        # instead of building an intermediate dict and serializing the
+        # whole thing again; multi-MB logs would otherwise be copied
+        # 2-3x on the way out.
+        body = b"".join((
+            b'{"job_id":', _dumps(job_id),
+            b',"logs":', _dumps(content),
+            b',"tail":', str(tail).encode(), b"}",
+        ))
+
         return func.HttpResponse(
-            json.dumps(response_data),
+            body,
             status_code=200,
             mimetype="application/json",
         )
-        
+
     except Exception as e:
         logger.error(f"Failed to get logs for job {job_id}: {str(e)}", exc_info=True)
         return func.HttpResponse(
-            json.dumps({
+            _dumps({
                 "error": "Failed to get training logs",
                 "details": str(e),
             }),
@@ -411,7 +768,13 @@ def cleanup_training_job(req: func.HttpRequest) -> func.HttpResponse:
     
     if not job_id:
         return func.HttpResponse(
-            json.dumps({"error": "Missing job_id"}),
+            _ERR_MISSING_JOB_ID,
+            status_code=400,
+            mimetype="application/json",
+        )
+    if not _JOB_ID_RE.fullmatch(job_id):
+        return func.HttpResponse(
+            _ERR_INVALID_JOB_ID,
             status_code=400,
             mimetype="application/json",
         )
@@ -419,31 +782,36 @@ def cleanup_training_job(req: func.HttpRequest) -> func.HttpResponse:
     container_group_name = f"training-{job_id}"
     
     try:
-        credential = DefaultAzureCredential()
-        aci_client = ContainerInstanceManagementClient(credential, SUBSCRIPTION_ID)
+        aci_client = _get_aci_client()
         
         logger.info(f"Deleting container group: {container_group_name}")
-        poller = aci_client.container_groups.begin_delete(
-            RESOURCE_GROUP,
+        # Don't wait for the delete LRO (30-60s): ARM has accepted the
+        # operation once begin_delete returns, and blocking here pins a
+        # Function instance for the duration. Callers wanting confirmation
+        # can poll /status/{job_id} until it returns NotFound.
+        aci_client.container_groups.begin_delete(
+            CONFIG.resource_group,
             container_group_name,
+            polling_interval=5,
         )
-        poller.wait()
-        
+        _tag_cache.pop(job_id, None)
+
         response_data = {
             "job_id": job_id,
-            "message": "Training job cleaned up successfully",
+            "status": "deleting",
+            "message": "Training job cleanup started",
         }
-        
+
         return func.HttpResponse(
-            json.dumps(response_data),
-            status_code=200,
+            _dumps(response_data),
+            status_code=202,
             mimetype="application/json",
         )
         
     except Exception as e:
         logger.error(f"Failed to cleanup job {job_id}: {str(e)}", exc_info=True)
         return func.HttpResponse(
-            json.dumps({
+            _dumps({
                 "error": "Failed to cleanup training job",
                 "details": str(e),
             }),
@@ -9,15 +9,17 @@ This function:
 5. Returns job ID and status URL
 """
 
-import json
 import logging
 import os
+import threading
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
 
 import azure.functions as func
-from azure.identity import DefaultAzureCredential
-from azure.mgmt.containerinstance import ContainerInstanceManagementClient
+import orjson
+from azure.identity.aio import DefaultAzureCredential
+from azure.mgmt.containerinstance.aio import ContainerInstanceManagementClient
 from azure.mgmt.containerinstance.models import (
     AzureFileVolume,
     Container,
@@ -32,36 +34,241 @@ from azure.mgmt.containerinstance.models import (
     Volume,
     VolumeMount,
 )
+from cachetools import TTLCache
 
 app = func.FunctionApp()
 
-# Configuration from environment variables
-SUBSCRIPTION_ID = os.environ["AZURE_SUBSCRIPTION_ID"]
-RESOURCE_GROUP = os.environ["AZURE_RESOURCE_GROUP"]
-LOCATION = os.environ.get("AZURE_LOCATION", "eastus")
 
-# Azure Container Registry
-ACR_LOGIN_SERVER = os.environ["ACR_LOGIN_SERVER"]  # e.g., myregistry.azurecr.io
-ACR_USERNAME = os.environ.get("ACR_USERNAME")
-ACR_PASSWORD = os.environ.get("ACR_PASSWORD")
-TRAINING_IMAGE = os.environ["TRAINING_IMAGE"]  # e.g., myregistry.azurecr.io/trainer:latest
+@dataclass(frozen=True, slots=True)
+class Config:
+    """
+    All environment configuration, read and validated once at import.
+    Handlers read attributes on this frozen object instead of hitting the
+    live os.environ proxy per request, and a missing variable fails with
+    one clear error naming every absent setting rather than a KeyError
+    inside the first handler that needs it.
+    """
 
-# Azure Files Storage
-STORAGE_ACCOUNT_NAME = os.environ["STORAGE_ACCOUNT_NAME"]
-STORAGE_ACCOUNT_KEY = os.environ["STORAGE_ACCOUNT_KEY"]
-DATASET_SHARE_NAME = os.environ.get("DATASET_SHARE_NAME", "datasets")
-MODEL_SHARE_NAME = os.environ.get("MODEL_SHARE_NAME", "models")
-OUTPUT_SHARE_NAME = os.environ.get("OUTPUT_SHARE_NAME", "outputs")
+    subscription_id: str
+    resource_group: str
+    location: str
+    # Azure Container Registry
+    acr_login_server: str  # e.g., myregistry.azurecr.io
+    acr_username: str | None
+    acr_password: str | None
+    training_image: str  # e.g., myregistry.azurecr.io/trainer:latest
+    # Azure Files Storage
+    storage_account_name: str
+    storage_account_key: str
+    dataset_share_name: str
+    model_share_name: str
+    output_share_name: str
+    function_app_url: str
+    # Training defaults
+    default_epochs: int
+    default_patience: int
+    default_batch: int
+    default_imgsz: int
+    default_min_delta: float
+    # Tensor-Core-capable by default; the old hardcoded K80 (compute
+    # 3.7, no FP16 acceleration) was a 3-5x ceiling on YOLO training.
+    default_gpu_sku: str
 
-# Training defaults
-DEFAULT_EPOCHS = int(os.environ.get("DEFAULT_EPOCHS", "100"))
-DEFAULT_PATIENCE = int(os.environ.get("DEFAULT_PATIENCE", "50"))
-DEFAULT_BATCH = int(os.environ.get("DEFAULT_BATCH", "24"))
-DEFAULT_IMGSZ = int(os.environ.get("DEFAULT_IMGSZ", "640"))
+    @classmethod
+    def from_environment(cls) -> "Config":
+        required = (
+            "AZURE_SUBSCRIPTION_ID",
+            "AZURE_RESOURCE_GROUP",
+            "ACR_LOGIN_SERVER",
+            "TRAINING_IMAGE",
+            "STORAGE_ACCOUNT_NAME",
+            "STORAGE_ACCOUNT_KEY",
+        )
+        missing = [name for name in required if name not in os.environ]
+        if missing:
+            raise RuntimeError(
+                f"Missing required environment variables: {', '.join(missing)}"
+            )
+        return cls(
+            subscription_id=os.environ["AZURE_SUBSCRIPTION_ID"],
+            resource_group=os.environ["AZURE_RESOURCE_GROUP"],
+            location=os.environ.get("AZURE_LOCATION", "eastus"),
+            acr_login_server=os.environ["ACR_LOGIN_SERVER"],
+            acr_username=os.environ.get("ACR_USERNAME"),
+            acr_password=os.environ.get("ACR_PASSWORD"),
+            training_image=os.environ["TRAINING_IMAGE"],
+            storage_account_name=os.environ["STORAGE_ACCOUNT_NAME"],
+            storage_account_key=os.environ["STORAGE_ACCOUNT_KEY"],
+            dataset_share_name=os.environ.get("DATASET_SHARE_NAME", "datasets"),
+            model_share_name=os.environ.get("MODEL_SHARE_NAME", "models"),
+            output_share_name=os.environ.get("OUTPUT_SHARE_NAME", "outputs"),
+            function_app_url=os.environ.get(
+                "FUNCTION_APP_URL", "https://your-function-app.azurewebsites.net"
+            ),
+            default_epochs=int(os.environ.get("DEFAULT_EPOCHS", "100")),
+            default_patience=int(os.environ.get("DEFAULT_PATIENCE", "50")),
+            default_batch=int(os.environ.get("DEFAULT_BATCH", "24")),
+            default_imgsz=int(os.environ.get("DEFAULT_IMGSZ", "640")),
+            default_min_delta=float(os.environ.get("DEFAULT_MIN_DELTA", "1e-4")),
+            default_gpu_sku=os.environ.get("DEFAULT_GPU_SKU", "V100"),
+        )
+
+
+CFG = Config.from_environment()
 
 
 logger = logging.getLogger(__name__)
 
+# Share names, storage account and ACR credentials are read from the
+# environment once and never change, so the Swagger-generated model
+# objects (whose __init__ validates every field) are built once here
+# instead of per request.
+_VOLUMES = [
+    Volume(
+        name="datasets",
+        azure_file=AzureFileVolume(
+            share_name=CFG.dataset_share_name,
+            storage_account_name=CFG.storage_account_name,
+            storage_account_key=CFG.storage_account_key,
+        ),
+    ),
+    Volume(
+        name="models",
+        azure_file=AzureFileVolume(
+            share_name=CFG.model_share_name,
+            storage_account_name=CFG.storage_account_name,
+            storage_account_key=CFG.storage_account_key,
+        ),
+    ),
+    Volume(
+        name="outputs",
+        azure_file=AzureFileVolume(
+            share_name=CFG.output_share_name,
+            storage_account_name=CFG.storage_account_name,
+            storage_account_key=CFG.storage_account_key,
+        ),
+    ),
+]
+
+_VOLUME_MOUNTS = [
+    VolumeMount(name="datasets", mount_path="/mnt/datasets", read_only=True),
+    VolumeMount(name="models", mount_path="/mnt/models", read_only=True),
+    VolumeMount(name="outputs", mount_path="/mnt/outputs", read_only=False),
+]
+
+_IMAGE_REGISTRY_CREDENTIALS = None
+if CFG.acr_username and CFG.acr_password:
+    _IMAGE_REGISTRY_CREDENTIALS = [
+        ImageRegistryCredential(
+            server=CFG.acr_login_server,
+            username=CFG.acr_username,
+            password=CFG.acr_password,
+        )
+    ]
+
+# Shared async ACI client: credential creation runs the full MSAL/IMDS
+# probe chain and the management client builds a fresh HTTP pipeline, so
+# doing it per request adds hundreds of ms. One lazily-built client per
+# warm instance shares the token cache and HTTPS connection pool, and
+# the aio variants let one worker multiplex many in-flight ARM calls.
+_credential = None
+_aci_client = None
+_client_lock = threading.Lock()
+
+# Status polls arrive every few seconds per job; every one of them was a
+# full ARM GET (REST round-trip + multi-KB JSON parse) that counts
+# against the subscription's read quota. A 5s TTL absorbs the poll storm
+# while staying fresher than ACI state transitions; terminal jobs can
+# never change again so they get an hour.
+_status_cache = TTLCache(maxsize=1024, ttl=5)
+_terminal_status_cache = TTLCache(maxsize=1024, ttl=3600)
+_status_cache_lock = threading.Lock()
+
+
+def _get_aci_client() -> ContainerInstanceManagementClient:
+    """Return the shared ContainerInstanceManagementClient, building it once."""
+    global _credential, _aci_client
+    if _aci_client is None:
+        with _client_lock:
+            if _aci_client is None:
+                _credential = DefaultAzureCredential(
+                    # These probes always fail inside Functions; skipping
+                    # them shortens the first token acquisition.
+                    exclude_interactive_browser_credential=True,
+                    exclude_visual_studio_code_credential=True,
+                )
+                _aci_client = ContainerInstanceManagementClient(
+                    _credential, CFG.subscription_id
+                )
+    return _aci_client
+
+
+def _json_response(data: dict, status: int = 200) -> func.HttpResponse:
+    """
+    Serialize a response with orjson: C-speed string escaping (which
+    dominates for MB-scale log payloads) and bytes output, skipping the
+    utf-8 encode HttpResponse would otherwise do. OPT_NAIVE_UTC covers
+    the datetimes ARM instance views can carry.
+    """
+    return func.HttpResponse(
+        orjson.dumps(data, option=orjson.OPT_NAIVE_UTC),
+        status_code=status,
+        mimetype="application/json",
+    )
+
+
+def _derive_status(job_id: str, container_group: ContainerGroup) -> tuple[dict, bool]:
+    """
+    Translate a container group into the /status response payload.
+    Returns (response_data, terminal) where ``terminal`` marks states
+    that can never change again (safe for long-TTL caching).
+    """
+    container_state = None
+    exit_code = None
+
+    if container_group.containers and container_group.containers[0].instance_view:
+        current_state = container_group.containers[0].instance_view.current_state
+        if current_state:
+            container_state = current_state.state
+            exit_code = current_state.exit_code
+
+    response_data = {
+        "job_id": job_id,
+        "provisioning_state": container_group.provisioning_state,
+        "container_state": container_state,
+        "exit_code": exit_code,
+        "output_path": f"/mnt/outputs/tflite/{job_id}",
+        "created_at": container_group.tags.get("created_at") if container_group.tags else None,
+    }
+
+    # Determine overall status
+    if container_group.provisioning_state == "Succeeded":
+        if container_state == "Terminated":
+            if exit_code == 0:
+                response_data["status"] = "completed"
+                response_data["message"] = "Training completed successfully"
+            else:
+                response_data["status"] = "failed"
+                response_data["message"] = f"Training failed with exit code {exit_code}"
+        else:
+            response_data["status"] = "running"
+            response_data["message"] = "Training in progress"
+    elif container_group.provisioning_state == "Failed":
+        response_data["status"] = "failed"
+        response_data["message"] = "Container provisioning failed"
+    else:
+        response_data["status"] = "provisioning"
+        response_data["message"] = "Container is being provisioned"
+
+    terminal = (
+        container_group.provisioning_state == "Failed"
+        or (
+            container_group.provisioning_state == "Succeeded"
+            and container_state == "Terminated"
+        )
+    )
+    return response_data, terminal
+
 
 def create_container_group(
     job_id: str,
@@ -71,10 +278,12 @@ def create_container_group(
     patience: int,
     batch: int,
     imgsz: int,
+    min_delta: float = 1e-4,
+    gpu_sku: str = None,
 ) -> ContainerGroup:
     """
     Create an Azure Container Instance with GPU for training.
-    
+
     Args:
         job_id: Unique identifier for this training job
         coco_zip_path: Path to COCO ZIP in Azure Files (e.g., "my_dataset/coco.zip")
@@ -83,47 +292,14 @@ def create_container_group(
         patience: Early stopping patience
         batch: Batch size
         imgsz: Image size
-        
+        min_delta: Minimum fitness gain that resets the early-stopping counter
+        gpu_sku: ACI GPU SKU (e.g., "T4", "V100"); defaults to CFG.default_gpu_sku
+
     Returns:
         ContainerGroup object
     """
     container_group_name = f"training-{job_id}"
-    
-    # Define volumes (Azure Files mounts)
-    volumes = [
-        Volume(
-            name="datasets",
-            azure_file=AzureFileVolume(
-                share_name=DATASET_SHARE_NAME,
-                storage_account_name=STORAGE_ACCOUNT_NAME,
-                storage_account_key=STORAGE_ACCOUNT_KEY,
-            ),
-        ),
-        Volume(
-            name="models",
-            azure_file=AzureFileVolume(
-                share_name=MODEL_SHARE_NAME,
-                storage_account_name=STORAGE_ACCOUNT_NAME,
-                storage_account_key=STORAGE_ACCOUNT_KEY,
-            ),
-        ),
-        Volume(
-            name="outputs",
-            azure_file=AzureFileVolume(
-                share_name=OUTPUT_SHARE_NAME,
-                storage_account_name=STORAGE_ACCOUNT_NAME,
-                storage_account_key=STORAGE_ACCOUNT_KEY,
-            ),
-        ),
-    ]
-    
-    # Define volume mounts
-    volume_mounts = [
-        VolumeMount(name="datasets", mount_path="/mnt/datasets", read_only=True),
-        VolumeMount(name="models", mount_path="/mnt/models", read_only=True),
-        VolumeMount(name="outputs", mount_path="/mnt/outputs", read_only=False),
-    ]
-    
+
     # Container command arguments
     command = [
         "--coco-zip", f"/mnt/datasets/{coco_zip_path}",
@@ -132,6 +308,7 @@ def create_container_group(
         "--tflite-out-dir", f"/mnt/outputs/tflite/{job_id}",
         "--epochs", str(epochs),
         "--patience", str(patience),
+        "--min-delta", str(min_delta),
         "--batch", str(batch),
         "--imgsz", str(imgsz),
         "--device", "0",
@@ -141,10 +318,21 @@ def create_container_group(
     environment_variables = [
         EnvironmentVariable(name="JOB_ID", value=job_id),
         EnvironmentVariable(name="STARTED_AT", value=datetime.utcnow().isoformat()),
+        # Tune PyTorch's CUDA caching allocator: expandable segments grow
+        # one region instead of splitting blocks every epoch, capped
+        # split size and GC threshold keep fragmentation from forcing
+        # cudaMalloc/cudaFree back onto the training hot path.
+        EnvironmentVariable(
+            name="PYTORCH_CUDA_ALLOC_CONF",
+            value="expandable_segments:True,max_split_size_mb:512,"
+                  "garbage_collection_threshold:0.8",
+        ),
+        # Fixed cuBLAS workspace so it is reused rather than reallocated.
+        EnvironmentVariable(name="CUBLAS_WORKSPACE_CONFIG", value=":4096:8"),
     ]
-    
-    # GPU resource (NVIDIA Tesla K80, T4, V100, etc.)
-    gpu_resource = GpuResource(count=1, sku="K80")  # Change SKU as needed (K80, P100, V100)
+
+    # GPU resource (NVIDIA Tesla T4, V100, etc.)
+    gpu_resource = GpuResource(count=1, sku=gpu_sku or CFG.default_gpu_sku)
     
     # Resource requirements
     resource_requirements = ResourceRequirements(
@@ -158,32 +346,21 @@ def create_container_group(
     # Container definition
     container = Container(
         name="trainer",
-        image=TRAINING_IMAGE,
+        image=CFG.training_image,
         resources=resource_requirements,
         command=command,
-        volume_mounts=volume_mounts,
+        volume_mounts=_VOLUME_MOUNTS,
         environment_variables=environment_variables,
     )
-    
-    # Image registry credentials
-    image_registry_credentials = None
-    if ACR_USERNAME and ACR_PASSWORD:
-        image_registry_credentials = [
-            ImageRegistryCredential(
-                server=ACR_LOGIN_SERVER,
-                username=ACR_USERNAME,
-                password=ACR_PASSWORD,
-            )
-        ]
-    
+
     # Container group
     container_group = ContainerGroup(
-        location=LOCATION,
+        location=CFG.location,
         containers=[container],
         os_type=OperatingSystemTypes.linux,
         restart_policy=ContainerGroupRestartPolicy.never,  # Don't restart on failure
-        volumes=volumes,
-        image_registry_credentials=image_registry_credentials,
+        volumes=_VOLUMES,
+        image_registry_credentials=_IMAGE_REGISTRY_CREDENTIALS,
         tags={
             "job_id": job_id,
             "purpose": "yolo-training",
@@ -195,7 +372,7 @@ def create_container_group(
 
 
 @app.route(route="train", methods=["POST"], auth_level=func.AuthLevel.FUNCTION)
-def trigger_training(req: func.HttpRequest) -> func.HttpResponse:
+async def trigger_training(req: func.HttpRequest) -> func.HttpResponse:
     """
     HTTP trigger to start a training job.
     
@@ -224,31 +401,25 @@ def trigger_training(req: func.HttpRequest) -> func.HttpResponse:
         # Parse request body
         req_body = req.get_json()
     except ValueError:
-        return func.HttpResponse(
-            json.dumps({"error": "Invalid JSON in request body"}),
-            status_code=400,
-            mimetype="application/json",
-        )
+        return _json_response({"error": "Invalid JSON in request body"}, status=400)
     
     # Validate required fields
     coco_zip_path = req_body.get("coco_zip_path")
     base_model_path = req_body.get("base_model_path")
     
     if not coco_zip_path or not base_model_path:
-        return func.HttpResponse(
-            json.dumps({
-                "error": "Missing required fields: coco_zip_path, base_model_path"
-            }),
-            status_code=400,
-            mimetype="application/json",
-        )
+        return _json_response({
+            "error": "Missing required fields: coco_zip_path, base_model_path"
+        }, status=400)
     
     # Get optional parameters with defaults
-    epochs = req_body.get("epochs", DEFAULT_EPOCHS)
-    patience = req_body.get("patience", DEFAULT_PATIENCE)
-    batch = req_body.get("batch", DEFAULT_BATCH)
-    imgsz = req_body.get("imgsz", DEFAULT_IMGSZ)
-    
+    epochs = req_body.get("epochs", CFG.default_epochs)
+    patience = req_body.get("patience", CFG.default_patience)
+    batch = req_body.get("batch", CFG.default_batch)
+    imgsz = req_body.get("imgsz", CFG.default_imgsz)
+    min_delta = req_body.get("min_delta", CFG.default_min_delta)
+    gpu_sku = req_body.get("gpu_sku", CFG.default_gpu_sku)
+
     # Generate unique job ID
     job_id = str(uuid.uuid4())[:8]
     
@@ -258,8 +429,7 @@ def trigger_training(req: func.HttpRequest) -> func.HttpResponse:
     
     try:
         # Create Azure Container Instance
-        credential = DefaultAzureCredential()
-        aci_client = ContainerInstanceManagementClient(credential, SUBSCRIPTION_ID)
+        aci_client = _get_aci_client()
         
         container_group_name, container_group = create_container_group(
             job_id=job_id,
@@ -269,30 +439,32 @@ def trigger_training(req: func.HttpRequest) -> func.HttpResponse:
             patience=patience,
             batch=batch,
             imgsz=imgsz,
+            min_delta=min_delta,
+            gpu_sku=gpu_sku,
         )
         
-        # Deploy the container group
+        # Deploy the container group. ARM acknowledges the create
+        # synchronously; waiting on the poller would block the function
+        # for the full provisioning handshake (often 10-60s) that the
+        # caller is going to poll /status/{job_id} for anyway.
         logger.info(f"Deploying container group: {container_group_name}")
-        poller = aci_client.container_groups.begin_create_or_update(
-            RESOURCE_GROUP,
+        poller = await aci_client.container_groups.begin_create_or_update(
+            CFG.resource_group,
             container_group_name,
             container_group,
         )
-        
-        # Wait for provisioning to start (don't wait for completion)
-        result = poller.result()
-        
-        logger.info(f"Container group {container_group_name} provisioning state: "
-                    f"{result.provisioning_state}")
+
+        logger.info(f"Container group {container_group_name} deployment accepted: "
+                    f"{poller.status()}")
         
         # Build status URL
         # Note: Update this with your actual function app URL
-        function_app_url = os.environ.get("FUNCTION_APP_URL", "https://your-function-app.azurewebsites.net")
+        function_app_url = CFG.function_app_url
         status_url = f"{function_app_url}/api/status/{job_id}"
         
         response_data = {
             "job_id": job_id,
-            "status": result.provisioning_state.lower(),
+            "status": "provisioning",
             "container_group_name": container_group_name,
             "status_url": status_url,
             "message": "Training job started successfully",
@@ -301,31 +473,25 @@ def trigger_training(req: func.HttpRequest) -> func.HttpResponse:
                 "base_model_path": base_model_path,
                 "epochs": epochs,
                 "patience": patience,
+                "min_delta": min_delta,
                 "batch": batch,
                 "imgsz": imgsz,
+                "gpu_sku": gpu_sku,
             },
         }
         
-        return func.HttpResponse(
-            json.dumps(response_data),
-            status_code=202,  # Accepted
-            mimetype="application/json",
-        )
+        return _json_response(response_data, status=202)
         
     except Exception as e:
         logger.error(f"Failed to create training job: {str(e)}", exc_info=True)
-        return func.HttpResponse(
-            json.dumps({
-                "error": "Failed to create training job",
-                "details": str(e),
-            }),
-            status_code=500,
-            mimetype="application/json",
-        )
+        return _json_response({
+            "error": "Failed to create training job",
+            "details": str(e),
+        }, status=500)
 
 
 @app.route(route="status/{job_id}", methods=["GET"], auth_level=func.AuthLevel.FUNCTION)
-def get_training_status(req: func.HttpRequest) -> func.HttpResponse:
+async def get_training_status(req: func.HttpRequest) -> func.HttpResponse:
     """
     Get the status of a training job.
     
@@ -342,101 +508,182 @@ def get_training_status(req: func.HttpRequest) -> func.HttpResponse:
     job_id = req.route_params.get("job_id")
     
     if not job_id:
-        return func.HttpResponse(
-            json.dumps({"error": "Missing job_id"}),
-            status_code=400,
-            mimetype="application/json",
-        )
+        return _json_response({"error": "Missing job_id"}, status=400)
     
     container_group_name = f"training-{job_id}"
     
     try:
-        credential = DefaultAzureCredential()
-        aci_client = ContainerInstanceManagementClient(credential, SUBSCRIPTION_ID)
-        
-        # Get container group
-        container_group = aci_client.container_groups.get(
-            RESOURCE_GROUP,
-            container_group_name,
-        )
-        
-        # Extract status information
-        container_state = None
-        exit_code = None
-        
-        if container_group.containers and container_group.containers[0].instance_view:
-            current_state = container_group.containers[0].instance_view.current_state
-            if current_state:
-                container_state = current_state.state
-                exit_code = current_state.exit_code
-        
-        response_data = {
-            "job_id": job_id,
-            "provisioning_state": container_group.provisioning_state,
-            "container_state": container_state,
-            "exit_code": exit_code,
-            "output_path": f"/mnt/outputs/tflite/{job_id}",
-            "created_at": container_group.tags.get("created_at") if container_group.tags else None,
-        }
-        
-        # Determine overall status
-        if container_group.provisioning_state == "Succeeded":
-            if container_state == "Terminated":
-                if exit_code == 0:
-                    response_data["status"] = "completed"
-                    response_data["message"] = "Training completed successfully"
+        with _status_cache_lock:
+            container_group = _terminal_status_cache.get(
+                container_group_name
+            ) or _status_cache.get(container_group_name)
+
+        fresh = container_group is None
+        if fresh:
+            aci_client = _get_aci_client()
+            container_group = await aci_client.container_groups.get(
+                CFG.resource_group,
+                container_group_name,
+            )
+
+        response_data, terminal = _derive_status(job_id, container_group)
+        # Only store after a fresh ARM get: TTLCache.__setitem__ resets
+        # the entry's expiry, so writing back on a hit would let clients
+        # polling faster than the TTL keep a stale state alive forever.
+        if fresh:
+            with _status_cache_lock:
+                if terminal:
+                    _terminal_status_cache[container_group_name] = container_group
                 else:
-                    response_data["status"] = "failed"
-                    response_data["message"] = f"Training failed with exit code {exit_code}"
-            else:
-                response_data["status"] = "running"
-                response_data["message"] = "Training in progress"
-        elif container_group.provisioning_state == "Failed":
-            response_data["status"] = "failed"
-            response_data["message"] = "Container provisioning failed"
-        else:
-            response_data["status"] = "provisioning"
-            response_data["message"] = "Container is being provisioned"
-        
-        return func.HttpResponse(
-            json.dumps(response_data),
-            status_code=200,
-            mimetype="application/json",
-        )
-        
+                    _status_cache[container_group_name] = container_group
+
+        return _json_response(response_data)
+
     except Exception as e:
         logger.error(f"Failed to get status for job {job_id}: {str(e)}", exc_info=True)
-        return func.HttpResponse(
-            json.dumps({
-                "error": "Failed to get training status",
-                "details": str(e),
-            }),
-            status_code=500,
-            mimetype="application/json",
-        )
+        return _json_response({
+            "error": "Failed to get training status",
+            "details": str(e),
+        }, status=500)
+
+
+@app.route(route="status", methods=["GET"], auth_level=func.AuthLevel.FUNCTION)
+async def get_all_training_statuses(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Batch status for every training job in the resource group.
+
+    One ARM list call replaces N /status/{job_id} round-trips, which is
+    dramatically cheaper once more than a handful of jobs are in flight.
+    Returns a {job_id: status_dict} map; note the list payload may omit
+    per-container instance views, in which case jobs report "running"
+    until queried individually.
+    """
+    try:
+        aci_client = _get_aci_client()
+        statuses = {}
+        pages = aci_client.container_groups.list_by_resource_group(CFG.resource_group)
+        async for container_group in pages:
+            if not container_group.name.startswith("training-"):
+                continue
+            job_id = container_group.name[len("training-"):]
+            response_data, terminal = _derive_status(job_id, container_group)
+            statuses[job_id] = response_data
+            # Only share list results with the per-job caches when the
+            # payload includes the instance view; a degraded entry would
+            # make /status/{job_id} report a terminated job as "running"
+            # for the cache TTL.
+            containers = container_group.containers or ()
+            if containers and containers[0].instance_view:
+                with _status_cache_lock:
+                    if terminal:
+                        _terminal_status_cache[container_group.name] = container_group
+                    else:
+                        _status_cache[container_group.name] = container_group
+
+        return _json_response(statuses)
+
+    except Exception as e:
+        logger.error(f"Failed to list training statuses: {str(e)}", exc_info=True)
+        return _json_response({
+            "error": "Failed to list training statuses",
+            "details": str(e),
+        }, status=500)
+
+
+@app.route(route="job/{job_id}", methods=["GET"], auth_level=func.AuthLevel.FUNCTION)
+async def get_job(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Get status and (optionally) logs of a training job in one call.
+
+    The client's monitoring loop polls this route; ordinary polls pass no
+    query params and behave like /status/{job_id}, while the final poll
+    adds ?include_logs=true&tail=N to pick up the logs without a second
+    Function invocation.
+    """
+    job_id = req.route_params.get("job_id")
+    include_logs = req.params.get("include_logs", "").lower() in ("1", "true", "yes")
+    tail = req.params.get("tail", "1000")
+
+    if not job_id:
+        return _json_response({"error": "Missing job_id"}, status=400)
+
+    try:
+        tail = int(tail)
+    except ValueError:
+        tail = 1000
+
+    container_group_name = f"training-{job_id}"
+
+    try:
+        with _status_cache_lock:
+            container_group = _terminal_status_cache.get(
+                container_group_name
+            ) or _status_cache.get(container_group_name)
+
+        fresh = container_group is None
+        if fresh:
+            aci_client = _get_aci_client()
+            container_group = await aci_client.container_groups.get(
+                CFG.resource_group,
+                container_group_name,
+            )
+
+        response_data, terminal = _derive_status(job_id, container_group)
+        if fresh:
+            with _status_cache_lock:
+                if terminal:
+                    _terminal_status_cache[container_group_name] = container_group
+                else:
+                    _status_cache[container_group_name] = container_group
+
+        if include_logs:
+            try:
+                aci_client = _get_aci_client()
+                logs = await aci_client.containers.list_logs(
+                    CFG.resource_group,
+                    container_group_name,
+                    "trainer",
+                    tail=tail,
+                )
+                response_data["logs"] = logs.content
+                response_data["tail"] = tail
+            except Exception as log_error:
+                # Logs may not exist yet (container still provisioning);
+                # the status half of the response is still useful.
+                logger.warning(f"Failed to get logs for job {job_id}: {str(log_error)}")
+                response_data["logs"] = None
+
+        return _json_response(response_data)
+
+    except Exception as e:
+        logger.error(f"Failed to get job {job_id}: {str(e)}", exc_info=True)
+        return _json_response({
+            "error": "Failed to get training job",
+            "details": str(e),
+        }, status=500)
 
 
 @app.route(route="logs/{job_id}", methods=["GET"], auth_level=func.AuthLevel.FUNCTION)
-def get_training_logs(req: func.HttpRequest) -> func.HttpResponse:
+async def get_training_logs(req: func.HttpRequest) -> func.HttpResponse:
     """
     Get the logs of a training job.
-    
+
     Returns:
     {
         "job_id": "abc123",
         "logs": "...container logs...",
         "tail": 100  # Number of lines returned (if limited)
     }
+
+    Pass ?format=raw to receive the log body as text/plain with no JSON
+    wrapping at all (the cheapest option for large tails).
     """
     job_id = req.route_params.get("job_id")
     tail = req.params.get("tail", "1000")  # Default to last 1000 lines
+    raw = req.params.get("format") == "raw"
     
     if not job_id:
-        return func.HttpResponse(
-            json.dumps({"error": "Missing job_id"}),
-            status_code=400,
-            mimetype="application/json",
-        )
+        return _json_response({"error": "Missing job_id"}, status=400)
     
     try:
         tail = int(tail)
@@ -446,43 +693,49 @@ def get_training_logs(req: func.HttpRequest) -> func.HttpResponse:
     container_group_name = f"training-{job_id}"
     
     try:
-        credential = DefaultAzureCredential()
-        aci_client = ContainerInstanceManagementClient(credential, SUBSCRIPTION_ID)
+        aci_client = _get_aci_client()
         
         # Get container logs
-        logs = aci_client.containers.list_logs(
-            RESOURCE_GROUP,
+        logs = await aci_client.containers.list_logs(
+            CFG.resource_group,
             container_group_name,
             "trainer",  # Container name
             tail=tail,
         )
-        
-        response_data = {
-            "job_id": job_id,
-            "logs": logs.content,
-            "tail": tail,
-        }
-        
+        content = logs.content or ""
+
+        if raw:
+            return func.HttpResponse(
+                content,
+                status_code=200,
+                mimetype="text/plain",
+            )
+
+        # Splice the envelope around one orjson escape pass over the log
+        # body instead of building an intermediate dict, so the payload is
+        # copied once rather than raw + escaped copies side by side.
+        body = (
+            b'{"job_id":' + orjson.dumps(job_id)
+            + b',"logs":' + orjson.dumps(content)
+            + b',"tail":' + orjson.dumps(tail)
+            + b"}"
+        )
         return func.HttpResponse(
-            json.dumps(response_data),
+            body,
             status_code=200,
             mimetype="application/json",
         )
         
     except Exception as e:
         logger.error(f"Failed to get logs for job {job_id}: {str(e)}", exc_info=True)
-        return func.HttpResponse(
-            json.dumps({
-                "error": "Failed to get training logs",
-                "details": str(e),
-            }),
-            status_code=500,
-            mimetype="application/json",
-        )
+        return _json_response({
+            "error": "Failed to get training logs",
+            "details": str(e),
+        }, status=500)
 
 
 @app.route(route="cleanup/{job_id}", methods=["DELETE"], auth_level=func.AuthLevel.FUNCTION)
-def cleanup_training_job(req: func.HttpRequest) -> func.HttpResponse:
+async def cleanup_training_job(req: func.HttpRequest) -> func.HttpResponse:
     """
     Delete a training container group (cleanup after completion/failure).
     
@@ -495,44 +748,36 @@ def cleanup_training_job(req: func.HttpRequest) -> func.HttpResponse:
     job_id = req.route_params.get("job_id")
     
     if not job_id:
-        return func.HttpResponse(
-            json.dumps({"error": "Missing job_id"}),
-            status_code=400,
-            mimetype="application/json",
-        )
+        return _json_response({"error": "Missing job_id"}, status=400)
     
     container_group_name = f"training-{job_id}"
     
     try:
-        credential = DefaultAzureCredential()
-        aci_client = ContainerInstanceManagementClient(credential, SUBSCRIPTION_ID)
+        aci_client = _get_aci_client()
         
         # Delete container group
         logger.info(f"Deleting container group: {container_group_name}")
-        poller = aci_client.container_groups.begin_delete(
-            RESOURCE_GROUP,
+        poller = await aci_client.container_groups.begin_delete(
+            CFG.resource_group,
             container_group_name,
         )
-        poller.wait()
-        
+        await poller.wait()
+
+        # Drop any cached status for the deleted group.
+        with _status_cache_lock:
+            _status_cache.pop(container_group_name, None)
+            _terminal_status_cache.pop(container_group_name, None)
+
         response_data = {
             "job_id": job_id,
             "message": "Training job cleaned up successfully",
         }
         
-        return func.HttpResponse(
-            json.dumps(response_data),
-            status_code=200,
-            mimetype="application/json",
-        )
+        return _json_response(response_data)
         
     except Exception as e:
         logger.error(f"Failed to cleanup job {job_id}: {str(e)}", exc_info=True)
-        return func.HttpResponse(
-            json.dumps({
-                "error": "Failed to cleanup training job",
-                "details": str(e),
-            }),
-            status_code=500,
-            mimetype="application/json",
-        )
+        return _json_response({
+            "error": "Failed to cleanup training job",
+            "details": str(e),
+        }, status=500)
@@ -5,26 +5,65 @@ Usage: python api_client.py
 
 import json
 import os
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeout applied to every call; the long read timeout
+# covers slow log fetches.
+_TIMEOUT = (5, 60)
 
 
 class YOLOTrainingClient:
     """Client for interacting with the YOLO Training API."""
-    
+
     def __init__(self, function_url: str, function_key: str):
         """
         Initialize the client.
-        
+
         Args:
             function_url: Base URL of the Azure Function App
             function_key: Function key for authentication
         """
         self.function_url = function_url.rstrip("/")
         self.function_key = function_key
-        
+
+        # One session for all calls: keep-alive skips the TCP+TLS
+        # handshake on every poll (~100-300ms to an Azure region), and
+        # the adapter retries transient gateway errors with backoff.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[502, 503, 504],
+            ),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        # Last seen ETag and body per job: unchanged polls come back as a
+        # bodyless 304 and we re-serve the cached status dict.
+        self._etags: Dict[str, str] = {}
+        self._status_cache: Dict[str, Dict] = {}
+
+    def close(self) -> None:
+        """Close the underlying HTTP session."""
+        self._session.close()
+
+    def __enter__(self) -> "YOLOTrainingClient":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
     def start_training(
         self,
         coco_zip_path: str,
@@ -59,11 +98,29 @@ class YOLOTrainingClient:
             "imgsz": imgsz,
         }
         
-        response = requests.post(url, json=payload)
+        response = self._session.post(url, json=payload, timeout=_TIMEOUT)
         response.raise_for_status()
         
         return response.json()
     
+    def start_training_many(self, jobs: list) -> Dict:
+        """
+        Start several training jobs in one batched request.
+
+        Args:
+            jobs: List of dicts, each with the same keys start_training
+                accepts (coco_zip_path, base_model_path, epochs, ...)
+
+        Returns:
+            Response dict with a "jobs" list of per-job info
+        """
+        url = f"{self.function_url}/api/train/batch?code={self.function_key}"
+
+        response = self._session.post(url, json={"jobs": jobs}, timeout=_TIMEOUT)
+        response.raise_for_status()
+
+        return response.json()
+
     def get_status(self, job_id: str) -> Dict:
         """
         Get the status of a training job.
@@ -75,12 +132,46 @@ class YOLOTrainingClient:
             Response dict with status, container_state, etc.
         """
         url = f"{self.function_url}/api/status/{job_id}?code={self.function_key}"
-        
-        response = requests.get(url)
+
+        headers = {}
+        etag = self._etags.get(job_id)
+        if etag:
+            headers["If-None-Match"] = etag
+
+        response = self._session.get(url, headers=headers, timeout=_TIMEOUT)
+        if response.status_code == 304:
+            return self._status_cache[job_id]
         response.raise_for_status()
-        
-        return response.json()
+
+        status_data = response.json()
+        new_etag = response.headers.get("ETag")
+        if new_etag:
+            self._etags[job_id] = new_etag
+            self._status_cache[job_id] = status_data
+
+        return status_data
     
+    def get_job(self, job_id: str, include_logs: bool = False, tail: int = 1000) -> Dict:
+        """
+        Get status (and optionally logs) of a training job in one call.
+
+        Args:
+            job_id: Training job ID
+            include_logs: Also fetch container logs in the same response
+            tail: Number of log lines to retrieve when include_logs is set
+
+        Returns:
+            Response dict with status fields, plus "logs" when requested
+        """
+        url = f"{self.function_url}/api/job/{job_id}?code={self.function_key}"
+        if include_logs:
+            url += f"&include_logs=true&tail={tail}"
+
+        response = self._session.get(url, timeout=_TIMEOUT)
+        response.raise_for_status()
+
+        return response.json()
+
     def get_logs(self, job_id: str, tail: int = 1000) -> str:
         """
         Get the logs of a training job.
@@ -92,12 +183,18 @@ class YOLOTrainingClient:
         Returns:
             Log content as string
         """
-        url = f"{self.function_url}/api/logs/{job_id}?code={self.function_key}&tail={tail}"
-        
-        response = requests.get(url)
-        response.raise_for_status()
-        
-        return response.json()["logs"]
+        # format=raw gets text/plain with no JSON envelope; streaming the
+        # body in chunks avoids buffering multi-MB logs twice client-side.
+        url = (
+            f"{self.function_url}/api/logs/{job_id}"
+            f"?code={self.function_key}&tail={tail}&format=raw"
+        )
+
+        with self._session.get(url, stream=True, timeout=_TIMEOUT) as response:
+            response.raise_for_status()
+            return "".join(
+                response.iter_content(chunk_size=65536, decode_unicode=True)
+            )
     
     def cleanup(self, job_id: str) -> Dict:
         """
@@ -111,7 +208,7 @@ class YOLOTrainingClient:
         """
         url = f"{self.function_url}/api/cleanup/{job_id}?code={self.function_key}"
         
-        response = requests.delete(url)
+        response = self._session.delete(url, timeout=_TIMEOUT)
         response.raise_for_status()
         
         return response.json()
@@ -119,45 +216,79 @@ class YOLOTrainingClient:
     def wait_for_completion(
         self,
         job_id: str,
-        poll_interval: int = 30,
+        base_interval: float = 2.0,
+        max_interval: float = 60.0,
         timeout: Optional[int] = None,
         callback=None,
+        final_logs_tail: Optional[int] = None,
     ) -> Dict:
         """
         Wait for a training job to complete.
-        
+
+        Polls with exponential backoff: quickly at first (catching fast
+        jobs within seconds instead of on a fixed 30s tick), then easing
+        off toward ``max_interval`` so multi-hour jobs don't hammer the
+        API. The counter resets on every state transition, and a
+        Retry-After header from the server overrides the computed delay.
+
         Args:
             job_id: Training job ID
-            poll_interval: Seconds between status checks
+            base_interval: Initial seconds between status checks
+            max_interval: Upper bound on the poll interval
             timeout: Maximum seconds to wait (None = no timeout)
             callback: Optional function to call with each status update
-            
+            final_logs_tail: If set, fetch this many log lines together
+                with the terminal status (one batched call instead of a
+                separate get_logs round-trip); the result dict then
+                carries a "logs" key
+
         Returns:
             Final status dict
-            
+
         Raises:
             TimeoutError: If timeout is reached
             RuntimeError: If training fails
         """
         start_time = time.time()
-        
+        attempt = 0
+        last_status = None
+
         while True:
-            status_data = self.get_status(job_id)
+            url = f"{self.function_url}/api/job/{job_id}?code={self.function_key}"
+            response = self._session.get(url, timeout=_TIMEOUT)
+            response.raise_for_status()
+            status_data = response.json()
             status = status_data["status"]
-            
+
             if callback:
                 callback(status_data)
-            
-            if status == "completed":
-                return status_data
-            elif status == "failed":
+
+            if status in ("completed", "failed"):
+                if final_logs_tail is not None:
+                    status_data = self.get_job(
+                        job_id, include_logs=True, tail=final_logs_tail
+                    )
+                if status == "completed":
+                    return status_data
                 raise RuntimeError(f"Training failed: {status_data.get('message')}")
-            
+
             # Check timeout
             if timeout and (time.time() - start_time) > timeout:
                 raise TimeoutError(f"Training did not complete within {timeout} seconds")
-            
-            time.sleep(poll_interval)
+
+            if status != last_status:
+                last_status = status
+                attempt = 0
+
+            retry_after = response.headers.get("Retry-After")
+            if retry_after is not None:
+                interval = float(retry_after)
+            else:
+                interval = base_interval * 1.5 ** min(attempt, 10)
+                interval += random.uniform(0, base_interval)
+            attempt += 1
+
+            time.sleep(min(max_interval, interval))
 
 
 def main():
@@ -199,23 +330,22 @@ def main():
     try:
         final_status = client.wait_for_completion(
             job_id,
-            poll_interval=30,
             timeout=7200,  # 2 hours
             callback=status_callback,
         )
-        
+
         print(f"\n3. Training completed successfully!")
         print(f"   Output path: {final_status['output_path']}")
-        
-        # Get final logs
-        print(f"\n4. Getting final logs (last 50 lines)...")
-        logs = client.get_logs(job_id, tail=50)
-        print(logs)
-        
-        # Cleanup
-        print(f"\n5. Cleaning up container...")
-        cleanup_response = client.cleanup(job_id)
-        print(f"   {cleanup_response['message']}")
+
+        # Neither call depends on the other, so overlap the final log
+        # fetch with the container cleanup (the session handles
+        # concurrent requests fine) and save a round-trip of wall time.
+        print(f"\n4. Fetching final logs and cleaning up...")
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            logs_future = pool.submit(client.get_logs, job_id, 50)
+            cleanup_future = pool.submit(client.cleanup, job_id)
+            print(logs_future.result())
+            print(f"   {cleanup_future.result()['message']}")
         
     except Exception as e:
         print(f"\n✗ Error: {e}")